@@ -8,11 +8,22 @@ __version__ = "0.1.0"
 __author__ = "SAXS-XPCS Team"
 __email__ = "support@saxsxpcs.org"
 
-from .file_io import FileImporter
-from .gui import MainWindow
-
 __all__ = [
     'FileImporter',
     'MainWindow',
 ]
 
+
+def __getattr__(name):
+    """Import the public classes on first access.
+    
+    Headless use never loads PyQt5, and the GUI entry point can show its
+    splash screen before h5py and the readers are imported.
+    """
+    if name == 'FileImporter':
+        from .file_io import FileImporter
+        return FileImporter
+    if name == 'MainWindow':
+        from .gui import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -20,9 +20,20 @@ CONFIG_DIR = APP_DATA_DIR / "config"
 LOG_DIR = APP_DATA_DIR / "logs"
 CACHE_DIR = APP_DATA_DIR / "cache"
 
-# Create directories if they don't exist
-for directory in [APP_DATA_DIR, CONFIG_DIR, LOG_DIR, CACHE_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+_DIRS_CREATED = False
+
+def ensure_dirs():
+    """Create the application directories if they don't exist.
+    
+    Called on first use (logging setup, cache access) rather than at import
+    time, so headless imports and worker processes do no filesystem work.
+    """
+    global _DIRS_CREATED
+    if _DIRS_CREATED:
+        return
+    for directory in [APP_DATA_DIR, CONFIG_DIR, LOG_DIR, CACHE_DIR]:
+        directory.mkdir(parents=True, exist_ok=True)
+    _DIRS_CREATED = True
 
 # File formats
 SUPPORTED_EXTENSIONS = ['.h5', '.hdf5', '.nxs', '.nx']
@@ -53,6 +64,7 @@ DEFAULT_SETTINGS = {
         'use_multiprocessing': True,
         'max_workers': None,  # Use all available cores
         'chunk_size': 1000,
+        'cache_metadata': True,  # Cache parsed metadata in CACHE_DIR
     },
     'gui': {
         'theme': 'default',
@@ -5,10 +5,10 @@
 File I/O modules for SAXS and XPCS data.
 """
 
-from .base_reader import BaseReader
+from .base_reader import BaseReader, XPCSBundle
 from .hdf5_reader import HDF5Reader
 from .nexus_reader import NeXusReader
-from .mask_io import MaskIO
+from .mask_io import MaskIO, RectMask, MaskDelta
 from .file_importer import FileImporter, FileImporterFactory, FileFormatDetector
 from .beamlines.desy_p10 import DESYP10Reader
 from .beamlines.esrf_id02 import ESRFID02Reader
@@ -16,9 +16,12 @@ from .beamlines.esrf_id10 import ESRFID10Reader
 
 __all__ = [
     'BaseReader',
+    'XPCSBundle',
     'HDF5Reader',
     'NeXusReader',
     'MaskIO',
+    'RectMask',
+    'MaskDelta',
     'FileImporter',
     'FileImporterFactory',
     'FileFormatDetector',
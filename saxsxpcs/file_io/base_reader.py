@@ -6,14 +6,88 @@ Base reader class for SAXS and XPCS data files.
 """
 
 import os
+import pickle
+import hashlib
 import logging
+import numpy as np
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, NamedTuple, Optional
 
+from ..config import CACHE_DIR, DEFAULT_SETTINGS, ensure_dirs
 from ..utils.logging_config import LoggerMixin
 
+# Version of the cached metadata layout; bumped when the way metadata values
+# are built changes, so entries written by older versions are ignored
+CACHE_FORMAT = 2
+
 logger = logging.getLogger(__name__)
 
+class DataSpec(NamedTuple):
+    """Shape, dtype and size in bytes of a data entry."""
+    
+    shape: Optional[tuple]
+    dtype: Any
+    nbytes: int
+    
+    @classmethod
+    def of(cls, value: Any) -> 'DataSpec':
+        """Describe an array or array-like value without reading it."""
+        shape = getattr(value, 'shape', None)
+        dtype = getattr(value, 'dtype', None)
+        size = getattr(value, 'size', None)
+        nbytes = size * dtype.itemsize if size is not None and dtype is not None else 0
+        return cls(shape, dtype, nbytes)
+
+@dataclass
+class XPCSBundle:
+    """XPCS results stored as views into one contiguous buffer.
+    
+    Keeping g2, tau, intensity and two-time data in a single allocation of
+    one dtype lets downstream code process them together with unit-stride
+    access. Missing results are None.
+    """
+    
+    g2: Optional[np.ndarray] = None
+    tau: Optional[np.ndarray] = None
+    intensity: Optional[np.ndarray] = None
+    twotime: Optional[np.ndarray] = None
+    buffer: Optional[np.ndarray] = field(default=None, repr=False)
+    
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, Any], dtype=np.float32) -> 'XPCSBundle':
+        """Copy XPCS arrays into a shared buffer.
+        
+        Parameters
+        ----------
+        arrays : Dict[str, Any]
+            Dictionary as returned by a reader's ``get_xpcs_data``; keys
+            other than 'g2', 'tau', 'intensity' and 'twotime' are ignored.
+        dtype : data-type, optional
+            Dtype of the shared buffer, by default float32
+        
+        Returns
+        -------
+        XPCSBundle
+            Bundle whose arrays are views into ``buffer``.
+        """
+        present = {}
+        for name in ('g2', 'tau', 'intensity', 'twotime'):
+            if arrays.get(name) is not None:
+                present[name] = np.asarray(arrays[name])
+        
+        buffer = np.empty(sum(array.size for array in present.values()), dtype=dtype)
+        views = {}
+        offset = 0
+        for name, array in present.items():
+            view = buffer[offset:offset + array.size].reshape(array.shape)
+            np.copyto(view, array, casting='unsafe')
+            views[name] = view
+            offset += array.size
+        
+        return cls(buffer=buffer, **views)
+
 class BaseReader(ABC, LoggerMixin):
     """Abstract base class for file readers."""
     
@@ -27,11 +101,14 @@ class BaseReader(ABC, LoggerMixin):
         """
         self.file_path = file_path
         self.data = {}
+        self.data_specs: Dict[str, DataSpec] = {}
         self.metadata = {}
         self.is_open = False
         
-        # Validate file path
-        if not os.path.exists(file_path):
+        # Validate file path; the stat result is reused by get_file_info
+        try:
+            self._stat = os.stat(file_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
     
     @abstractmethod
@@ -82,6 +159,59 @@ class BaseReader(ABC, LoggerMixin):
         """
         return self.data
     
+    def get_frame(self, index: int = 0) -> Optional[np.ndarray]:
+        """Get a single detector frame.
+        
+        Only available for readers that provide ``get_saxs_data``. This
+        default reads the whole image stack; readers holding lazy dataset
+        handles override it to read just the frame.
+        
+        Parameters
+        ----------
+        index : int, optional
+            Frame index into an image stack, by default 0. Ignored for a
+            single 2D image.
+        
+        Returns
+        -------
+        Optional[np.ndarray]
+            2D frame, or None if there is no image data.
+        """
+        data = self.get_saxs_data()
+        if data is None:
+            return None
+        return data[index] if data.ndim >= 3 else data
+    
+    def get_xpcs_bundle(self, dtype=np.float32) -> XPCSBundle:
+        """Get the XPCS data as one contiguous bundle.
+        
+        Only available for readers that provide ``get_xpcs_data``.
+        
+        Parameters
+        ----------
+        dtype : data-type, optional
+            Dtype of the bundle's buffer, by default float32
+        
+        Returns
+        -------
+        XPCSBundle
+            XPCS arrays sharing one buffer.
+        """
+        return XPCSBundle.from_arrays(self.get_xpcs_data(), dtype)
+    
+    def _set_data(self, key: str, value: Any):
+        """Store a data entry and record its spec.
+        
+        Parameters
+        ----------
+        key : str
+            Data key.
+        value : Any
+            Array or lazy dataset handle.
+        """
+        self.data[key] = value
+        self.data_specs[key] = DataSpec.of(value)
+    
     def get_metadata(self) -> Dict[str, Any]:
         """Get the metadata dictionary.
         
@@ -100,7 +230,7 @@ class BaseReader(ABC, LoggerMixin):
         Dict[str, Any]
             Dictionary containing file information.
         """
-        stat = os.stat(self.file_path)
+        stat = self._stat
         return {
             'file_path': self.file_path,
             'file_name': os.path.basename(self.file_path),
@@ -109,9 +239,64 @@ class BaseReader(ABC, LoggerMixin):
             'creation_time': stat.st_ctime,
         }
     
+    def _cache_path(self) -> Path:
+        """Path of this file's metadata cache entry."""
+        key = hashlib.md5(os.path.abspath(self.file_path).encode('utf-8')).hexdigest()
+        return CACHE_DIR / f"{key}.pkl"
+    
+    def _cache_header(self) -> tuple:
+        """Key identifying the file version and reader for the metadata cache."""
+        return (CACHE_FORMAT, self.__class__.__name__, self._stat.st_mtime_ns, self._stat.st_size)
+    
+    def _load_cache(self) -> Optional[Dict[str, Any]]:
+        """Load cached metadata for this file.
+        
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The cached payload, or None if there is no entry or the file has
+            changed since it was written.
+        """
+        if not DEFAULT_SETTINGS['processing']['cache_metadata']:
+            return None
+        try:
+            with open(self._cache_path(), 'rb') as f:
+                header, payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable metadata cache for {self.file_path}: {e}")
+            return None
+        
+        if header != self._cache_header():
+            return None
+        self.logger.debug(f"Loaded metadata for {self.file_path} from cache")
+        return payload
+    
+    def _save_cache(self, payload: Dict[str, Any]):
+        """Save metadata for this file to the cache.
+        
+        Parameters
+        ----------
+        payload : Dict[str, Any]
+            Picklable metadata to cache; raw data arrays should not be included.
+        """
+        if not DEFAULT_SETTINGS['processing']['cache_metadata']:
+            return
+        try:
+            ensure_dirs()
+            cache_path = self._cache_path()
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((self._cache_header(), payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            self.logger.debug(f"Could not write metadata cache for {self.file_path}: {e}")
+    
     def __enter__(self):
-        """Context manager entry."""
-        self.open()
+        """Context manager entry; a file that is already open is reused."""
+        if not self.is_open:
+            self.open()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -7,24 +7,158 @@ DESY P10 beamline reader for SAXS and XPCS data.
 
 import logging
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Container, Dict, Any, Optional, Sequence
 
 from ..hdf5_reader import HDF5Reader
 
 logger = logging.getLogger(__name__)
 
+# Paths whose presence identifies a P10 file
+_P10_INDICATORS = (
+    '/entry/data/pilatus_data',
+    '/entry/instrument/detector/pilatus',
+    '/data/data',
+)
+
+# Beamline attribute values identifying a P10 file, as str and bytes
+_P10_TAGS = frozenset(['P10', 'p10', b'P10', b'p10'])
+_P10_KEYWORDS = ('P10',)
+
 class DESYP10Reader(HDF5Reader):
     """Reader for DESY P10 beamline files."""
     
-    def __init__(self, file_path: str):
+    # Common P10 metadata paths, in order of preference
+    METADATA_PATHS = {
+        'beam_center_x': [
+            '/entry/instrument/detector/beam_center_x',
+            '/entry/data/beam_center_x',
+            '/beam_center_x',
+        ],
+        'beam_center_y': [
+            '/entry/instrument/detector/beam_center_y',
+            '/entry/data/beam_center_y',
+            '/beam_center_y',
+        ],
+        'detector_distance': [
+            '/entry/instrument/detector/distance',
+            '/entry/data/detector_distance',
+            '/detector_distance',
+        ],
+        'wavelength': [
+            '/entry/instrument/source/wavelength',
+            '/entry/data/wavelength',
+            '/wavelength',
+        ],
+        'energy': [
+            '/entry/instrument/source/energy',
+            '/entry/data/energy',
+            '/energy',
+        ],
+        'pixel_size_x': [
+            '/entry/instrument/detector/x_pixel_size',
+            '/entry/data/pixel_size_x',
+            '/pixel_size_x',
+        ],
+        'pixel_size_y': [
+            '/entry/instrument/detector/y_pixel_size',
+            '/entry/data/pixel_size_y',
+            '/pixel_size_y',
+        ],
+        'exposure_time': [
+            '/entry/instrument/detector/count_time',
+            '/entry/data/exposure_time',
+            '/exposure_time',
+        ],
+        'sample_name': [
+            '/entry/sample/name',
+            '/entry/data/sample_name',
+            '/sample_name',
+        ],
+        'sample_temperature': [
+            '/entry/sample/temperature',
+            '/entry/data/sample_temperature',
+            '/sample_temperature',
+        ],
+        'start_time': [
+            '/entry/start_time',
+            '/entry/data/start_time',
+            '/start_time',
+        ],
+        'end_time': [
+            '/entry/end_time',
+            '/entry/data/end_time',
+            '/end_time',
+        ],
+    }
+    
+    # XPCS results returned by get_xpcs_data, stored under '<key>_data'
+    XPCS_KEYS = ('g2', 'tau', 'twotime', 'xpcs')
+    
+    # Common P10 data paths, in order of preference
+    DATA_PATHS = {
+        'detector_data': [
+            '/entry/data/data',
+            '/entry/instrument/detector/data',
+            '/entry/data/pilatus_data',
+            '/data/data',
+        ],
+        'saxs_data': [
+            '/entry/data/saxs',
+            '/entry/result/saxs',
+            '/saxs/data',
+        ],
+        'xpcs_data': [
+            '/entry/data/xpcs',
+            '/entry/result/xpcs',
+            '/xpcs/data',
+        ],
+        'g2_data': [
+            '/entry/result/g2',
+            '/entry/data/g2',
+            '/g2/data',
+            '/g2',
+        ],
+        'tau_data': [
+            '/entry/result/tau',
+            '/entry/data/tau',
+            '/tau/data',
+            '/tau',
+        ],
+        'twotime_data': [
+            '/entry/result/twotime',
+            '/entry/data/twotime',
+            '/twotime/data',
+            '/twotime',
+        ],
+        'q_map': [
+            '/entry/result/q_map',
+            '/entry/data/q_map',
+            '/q_map/data',
+            '/q_map',
+        ],
+        'mask': [
+            '/entry/data/mask',
+            '/entry/instrument/detector/mask',
+            '/mask/data',
+            '/mask',
+        ],
+    }
+    
+    # Path-keyed candidate tables resolved against the dataset index
+    _DATA_CANDIDATES = HDF5Reader._build_candidates(DATA_PATHS)
+    _METADATA_CANDIDATES = HDF5Reader._build_candidates(METADATA_PATHS)
+    
+    def __init__(self, file_path: str, **kwargs):
         """Initialize the DESY P10 reader.
         
         Parameters
         ----------
         file_path : str
             Path to the DESY P10 file to read.
+        **kwargs
+            Chunk cache settings passed on to ``HDF5Reader``.
         """
-        super().__init__(file_path)
+        super().__init__(file_path, **kwargs)
         self.beamline = "DESY P10"
     
     def read(self) -> bool:
@@ -39,157 +173,81 @@ class DESYP10Reader(HDF5Reader):
             if not self.is_open:
                 self.open()
             
+            cached = self._load_cache()
+            if cached is not None:
+                # Metadata and data paths are unchanged since the last read
+                self.read_p10_structure(cached['structure'])
+                self.read_all_datasets(lazy=True)
+                self.metadata.update(cached['metadata'])
+                return True
+            
             # Read DESY P10-specific structure
-            self.read_p10_structure()
+            structure = self.read_p10_structure()
             
-            # Also read all datasets and metadata
-            self.read_all_datasets()
-            self.read_metadata_to_dict()
+            # Index the remaining datasets as lazy handles and read all
+            # attributes in one walk; nothing is read twice
+            self.read_contents(lazy=True)
             
             # Extract and organize P10-specific metadata
             self.extract_p10_metadata()
             
+            # Attributes of the datasets in the P10 structure (units etc.)
+            for path in structure.values():
+                self.read_dataset_attrs(path)
+            
+            self._save_cache({'structure': structure, 'metadata': self.metadata})
             return True
         except Exception as e:
             self.logger.error(f"Error reading DESY P10 file {self.file_path}: {e}")
             return False
     
-    def read_p10_structure(self):
-        """Read DESY P10-specific data structure."""
-        # Common P10 data paths
-        p10_paths = {
-            'detector_data': [
-                '/entry/data/data',
-                '/entry/instrument/detector/data',
-                '/entry/data/pilatus_data',
-                '/data/data',
-            ],
-            'saxs_data': [
-                '/entry/data/saxs',
-                '/entry/result/saxs',
-                '/saxs/data',
-            ],
-            'xpcs_data': [
-                '/entry/data/xpcs',
-                '/entry/result/xpcs',
-                '/xpcs/data',
-            ],
-            'g2_data': [
-                '/entry/result/g2',
-                '/entry/data/g2',
-                '/g2/data',
-                '/g2',
-            ],
-            'tau_data': [
-                '/entry/result/tau',
-                '/entry/data/tau',
-                '/tau/data',
-                '/tau',
-            ],
-            'twotime_data': [
-                '/entry/result/twotime',
-                '/entry/data/twotime',
-                '/twotime/data',
-                '/twotime',
-            ],
-            'q_map': [
-                '/entry/result/q_map',
-                '/entry/data/q_map',
-                '/q_map/data',
-                '/q_map',
-            ],
-            'mask': [
-                '/entry/data/mask',
-                '/entry/instrument/detector/mask',
-                '/mask/data',
-                '/mask',
-            ],
-        }
+    def read_p10_structure(self, structure: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Read DESY P10-specific data structure.
+        
+        Matched datasets are stored as lazy handles and only read when
+        requested through one of the ``get_*`` methods.
+        
+        Parameters
+        ----------
+        structure : Dict[str, str], optional
+            Previously resolved data paths, e.g. from the metadata cache. By
+            default the candidate paths are resolved against the file.
+        
+        Returns
+        -------
+        Dict[str, str]
+            Dictionary mapping data types to the dataset paths used.
+        """
+        if structure is None:
+            structure = self._resolve_paths(self._DATA_CANDIDATES)
         
-        for data_type, paths in p10_paths.items():
-            for path in paths:
-                data = self.read_dataset(path)
-                if data is not None:
-                    self.data[data_type] = data
-                    self.logger.debug(f"Read P10 {data_type} from {path} with shape {data.shape}")
-                    break  # Use the first found path
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        for data_type, path in structure.items():
+            data = self._lazy_dataset(path)
+            if data is None:
+                continue
+            self._set_data(data_type, data)
+            if debug:
+                self.logger.debug("Found P10 %s at %s with shape %s", data_type, path, data.shape)
+        
+        return structure
     
     def extract_p10_metadata(self):
-        """Extract DESY P10-specific metadata."""
-        # Common P10 metadata paths
-        metadata_paths = {
-            'beam_center_x': [
-                '/entry/instrument/detector/beam_center_x',
-                '/entry/data/beam_center_x',
-                '/beam_center_x',
-            ],
-            'beam_center_y': [
-                '/entry/instrument/detector/beam_center_y',
-                '/entry/data/beam_center_y',
-                '/beam_center_y',
-            ],
-            'detector_distance': [
-                '/entry/instrument/detector/distance',
-                '/entry/data/detector_distance',
-                '/detector_distance',
-            ],
-            'wavelength': [
-                '/entry/instrument/source/wavelength',
-                '/entry/data/wavelength',
-                '/wavelength',
-            ],
-            'energy': [
-                '/entry/instrument/source/energy',
-                '/entry/data/energy',
-                '/energy',
-            ],
-            'pixel_size_x': [
-                '/entry/instrument/detector/x_pixel_size',
-                '/entry/data/pixel_size_x',
-                '/pixel_size_x',
-            ],
-            'pixel_size_y': [
-                '/entry/instrument/detector/y_pixel_size',
-                '/entry/data/pixel_size_y',
-                '/pixel_size_y',
-            ],
-            'exposure_time': [
-                '/entry/instrument/detector/count_time',
-                '/entry/data/exposure_time',
-                '/exposure_time',
-            ],
-            'sample_name': [
-                '/entry/sample/name',
-                '/entry/data/sample_name',
-                '/sample_name',
-            ],
-            'sample_temperature': [
-                '/entry/sample/temperature',
-                '/entry/data/sample_temperature',
-                '/sample_temperature',
-            ],
-            'start_time': [
-                '/entry/start_time',
-                '/entry/data/start_time',
-                '/start_time',
-            ],
-            'end_time': [
-                '/entry/end_time',
-                '/entry/data/end_time',
-                '/end_time',
-            ],
-        }
+        """Extract DESY P10-specific metadata.
         
-        for key, paths in metadata_paths.items():
-            for path in paths:
-                data = self.read_dataset(path)
-                if data is not None:
-                    # Handle scalar values
-                    if isinstance(data, np.ndarray) and data.size == 1:
-                        data = data.item()
-                    self.metadata[key] = data
-                    self.logger.debug(f"Read P10 metadata {key}: {data}")
-                    break  # Use the first found path
+        Candidate paths are resolved against the file's dataset index; the
+        first listed path present for a key wins.
+        """
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        paths = self._resolve_paths(self._METADATA_CANDIDATES)
+        values = self._read_values(paths.values())
+        for key, path in paths.items():
+            data = values.get(path)
+            if data is None:
+                continue
+            self.metadata[key] = data
+            if debug:
+                self.logger.debug("Read P10 metadata %s: %s", key, data)
         
         # Add beamline information
         self.metadata['beamline'] = self.beamline
@@ -207,34 +265,55 @@ class DESYP10Reader(HDF5Reader):
         saxs_keys = ['saxs_data', 'detector_data', 'data']
         for key in saxs_keys:
             if key in self.data:
-                return self.data[key]
+                return self._materialize(self.data[key])
         return None
     
-    def get_xpcs_data(self) -> Dict[str, Optional[np.ndarray]]:
+    def get_frame(self, index: int = 0) -> Optional[np.ndarray]:
+        """Get a single detector frame.
+        
+        Only the requested frame of an image stack is read from the file.
+        
+        Parameters
+        ----------
+        index : int, optional
+            Frame index into an image stack, by default 0. Ignored for a
+            single 2D image.
+        
+        Returns
+        -------
+        Optional[np.ndarray]
+            2D frame, or None if not found.
+        """
+        for key in ['saxs_data', 'detector_data', 'data']:
+            if key in self.data:
+                data = self.data[key]
+                if getattr(data, 'ndim', 0) >= 3:
+                    return np.asarray(data[index])
+                return self._materialize(data)
+        return None
+    
+    def get_xpcs_data(self, keys: Optional[Sequence[str]] = None) -> Dict[str, Optional[np.ndarray]]:
         """Get XPCS data.
         
+        Parameters
+        ----------
+        keys : Sequence[str], optional
+            XPCS keys to read, e.g. ('g2', 'tau'), by default all of
+            XPCS_KEYS
+        
         Returns
         -------
         Dict[str, Optional[np.ndarray]]
             Dictionary containing XPCS data arrays.
         """
-        xpcs_data = {}
-        
-        # Get g2 data
-        if 'g2_data' in self.data:
-            xpcs_data['g2'] = self.data['g2_data']
+        if keys is None:
+            keys = self.XPCS_KEYS
         
-        # Get tau data
-        if 'tau_data' in self.data:
-            xpcs_data['tau'] = self.data['tau_data']
-        
-        # Get two-time correlation data
-        if 'twotime_data' in self.data:
-            xpcs_data['twotime'] = self.data['twotime_data']
-        
-        # Get XPCS data (if available as a single dataset)
-        if 'xpcs_data' in self.data:
-            xpcs_data['xpcs'] = self.data['xpcs_data']
+        xpcs_data = {}
+        for key in keys:
+            data_key = f'{key}_data'
+            if data_key in self.data:
+                xpcs_data[key] = self._materialize(self.data[data_key])
         
         return xpcs_data
     
@@ -246,7 +325,7 @@ class DESYP10Reader(HDF5Reader):
         Optional[np.ndarray]
             Q-map array, or None if not found.
         """
-        return self.data.get('q_map')
+        return self._materialize(self.data.get('q_map'))
     
     def get_mask(self) -> Optional[np.ndarray]:
         """Get mask data.
@@ -256,92 +335,37 @@ class DESYP10Reader(HDF5Reader):
         Optional[np.ndarray]
             Mask array, or None if not found.
         """
-        return self.data.get('mask')
+        return self._materialize(self.data.get('mask'))
     
     @classmethod
-    def can_read(cls, file_path: str) -> bool:
-        """Check if the file can be read by this reader.
+    def can_read_from_index(cls, names: Container[str], attrs: Dict[str, Any]) -> bool:
+        """Check if a probed file can be read by this reader.
         
         Parameters
         ----------
-        file_path : str
-            Path to the file to check.
+        names : Container[str]
+            Membership test for absolute object paths in the file.
+        attrs : Dict[str, Any]
+            Root attributes of the file.
         
         Returns
         -------
         bool
             True if the file can be read by this reader, False otherwise.
         """
-        try:
-            # First check if it's a valid HDF5 file
-            if not super().can_read(file_path):
-                return False
-            
-            # Check for P10-specific structure
-            import h5py
-            with h5py.File(file_path, 'r') as f:
-                # Look for P10-specific paths or attributes
-                p10_indicators = [
-                    '/entry/data/pilatus_data',
-                    '/entry/instrument/detector/pilatus',
-                    '/data/data',
-                ]
-                
-                for indicator in p10_indicators:
-                    if indicator in f:
-                        return True
-                
-                # Check for P10-specific attributes
-                if 'beamline' in f.attrs:
-                    beamline = f.attrs['beamline']
-                    if isinstance(beamline, bytes):
-                        beamline = beamline.decode('utf-8')
-                    if 'P10' in str(beamline).upper():
-                        return True
-                
-                return False
-        except Exception:
-            return False
-
-    @classmethod
-    def can_read_file(cls, file_path):
-        """Check if this reader can read the given file.
+        # Check the beamline attribute for P10 first, as it needs no lookups
+        # in the file; other PETRA III beamlines share the DESY facility, so
+        # that is not enough. Exact tags are a set lookup, anything else
+        # falls back to a substring test
+        value = attrs.get('beamline')
+        if isinstance(value, (str, bytes)):
+            if value in _P10_TAGS:
+                return True
+            if isinstance(value, bytes):
+                value = value.decode('utf-8', errors='replace')
+            value = value.upper()
+            if any(keyword in value for keyword in _P10_KEYWORDS):
+                return True
         
-        Parameters
-        ----------
-        file_path : str
-            Path to the file to check.
-            
-        Returns
-        -------
-        bool
-            True if this reader can read the file, False otherwise.
-        """
-        try:
-            import h5py
-            with h5py.File(file_path, 'r') as f:
-                # Check for P10-specific indicators
-                p10_indicators = [
-                    'entry/instrument/pilatus',
-                    'entry/instrument/detector',
-                    'pilatus',
-                    'detector'
-                ]
-                
-                for indicator in p10_indicators:
-                    if indicator in f:
-                        return True
-                
-                # Check for P10 in file attributes or metadata
-                if hasattr(f, 'attrs'):
-                    for key, value in f.attrs.items():
-                        if isinstance(value, (str, bytes)):
-                            value_str = value.decode() if isinstance(value, bytes) else value
-                            if 'p10' in value_str.lower() or 'desy' in value_str.lower():
-                                return True
-                
-                return False
-                
-        except Exception:
-            return False
-
+        # Look for P10-specific paths
+        return any(indicator in names for indicator in _P10_INDICATORS)
@@ -7,24 +7,194 @@ ESRF ID10 beamline reader for SAXS and XPCS data.
 
 import logging
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Container, Dict, Any, Optional, Tuple, Sequence
 
 from ..hdf5_reader import HDF5Reader
 
 logger = logging.getLogger(__name__)
 
+# Paths whose presence identifies an ID10 file
+_ID10_INDICATORS = (
+    '/entry/data/maxipix_data',
+    '/entry/instrument/detector/maxipix',
+    '/detector/data',
+    '/correlation/g2',
+)
+
+# Attribute values identifying the beamline and facility, as str and bytes
+_ID10_TAGS = frozenset(['ID10', 'id10', b'ID10', b'id10'])
+_ESRF_TAGS = frozenset(['ESRF', 'esrf', b'ESRF', b'esrf'])
+
 class ESRFID10Reader(HDF5Reader):
     """Reader for ESRF ID10 beamline files."""
     
-    def __init__(self, file_path: str):
+    # Only the known data paths are read; detector stacks elsewhere in the
+    # file are never loaded
+    BULK_LOAD = False
+    
+    # XPCS results returned by get_xpcs_data, stored under '<key>_data'
+    XPCS_KEYS = ('g2', 'tau', 'twotime', 'intensity', 'xpcs')
+    
+    # Common ID10 data paths, in order of preference
+    DATA_PATHS = {
+        'detector_data': [
+            '/entry/data/data',
+            '/entry/instrument/detector/data',
+            '/entry/data/maxipix_data',
+            '/data/data',
+            '/detector/data',
+        ],
+        'saxs_data': [
+            '/entry/data/saxs',
+            '/entry/result/saxs',
+            '/saxs/data',
+            '/saxs',
+        ],
+        'xpcs_data': [
+            '/entry/data/xpcs',
+            '/entry/result/xpcs',
+            '/xpcs/data',
+            '/xpcs',
+        ],
+        'g2_data': [
+            '/entry/result/g2',
+            '/entry/data/g2',
+            '/g2/data',
+            '/g2',
+            '/correlation/g2',
+        ],
+        'tau_data': [
+            '/entry/result/tau',
+            '/entry/data/tau',
+            '/tau/data',
+            '/tau',
+            '/correlation/tau',
+        ],
+        'twotime_data': [
+            '/entry/result/twotime',
+            '/entry/data/twotime',
+            '/twotime/data',
+            '/twotime',
+            '/correlation/twotime',
+        ],
+        'intensity_data': [
+            '/entry/result/intensity',
+            '/entry/data/intensity',
+            '/intensity/data',
+            '/intensity',
+        ],
+        'q_map': [
+            '/entry/result/q_map',
+            '/entry/data/q_map',
+            '/q_map/data',
+            '/q_map',
+        ],
+        'mask': [
+            '/entry/data/mask',
+            '/entry/instrument/detector/mask',
+            '/mask/data',
+            '/mask',
+        ],
+    }
+    
+    # Common ID10 metadata paths, in order of preference
+    METADATA_PATHS = {
+        'beam_center_x': [
+            '/entry/instrument/detector/beam_center_x',
+            '/entry/data/beam_center_x',
+            '/beam_center_x',
+            '/detector/beam_center_x',
+        ],
+        'beam_center_y': [
+            '/entry/instrument/detector/beam_center_y',
+            '/entry/data/beam_center_y',
+            '/beam_center_y',
+            '/detector/beam_center_y',
+        ],
+        'detector_distance': [
+            '/entry/instrument/detector/distance',
+            '/entry/data/detector_distance',
+            '/detector_distance',
+            '/detector/distance',
+        ],
+        'wavelength': [
+            '/entry/instrument/source/wavelength',
+            '/entry/data/wavelength',
+            '/wavelength',
+            '/source/wavelength',
+        ],
+        'energy': [
+            '/entry/instrument/source/energy',
+            '/entry/data/energy',
+            '/energy',
+            '/source/energy',
+        ],
+        'pixel_size_x': [
+            '/entry/instrument/detector/x_pixel_size',
+            '/entry/data/pixel_size_x',
+            '/pixel_size_x',
+            '/detector/x_pixel_size',
+        ],
+        'pixel_size_y': [
+            '/entry/instrument/detector/y_pixel_size',
+            '/entry/data/pixel_size_y',
+            '/pixel_size_y',
+            '/detector/y_pixel_size',
+        ],
+        'exposure_time': [
+            '/entry/instrument/detector/count_time',
+            '/entry/data/exposure_time',
+            '/exposure_time',
+            '/detector/count_time',
+        ],
+        'frame_time': [
+            '/entry/instrument/detector/frame_time',
+            '/entry/data/frame_time',
+            '/frame_time',
+            '/detector/frame_time',
+        ],
+        'sample_name': [
+            '/entry/sample/name',
+            '/entry/data/sample_name',
+            '/sample_name',
+            '/sample/name',
+        ],
+        'sample_temperature': [
+            '/entry/sample/temperature',
+            '/entry/data/sample_temperature',
+            '/sample_temperature',
+            '/sample/temperature',
+        ],
+        'start_time': [
+            '/entry/start_time',
+            '/entry/data/start_time',
+            '/start_time',
+        ],
+        'end_time': [
+            '/entry/end_time',
+            '/entry/data/end_time',
+            '/end_time',
+        ],
+    }
+    
+    # One path-keyed table over data and metadata paths, resolved in a
+    # single pass against the dataset index
+    _CANDIDATES = HDF5Reader._build_candidates(dict(
+        [(('data', key), paths) for key, paths in DATA_PATHS.items()]
+        + [(('metadata', key), paths) for key, paths in METADATA_PATHS.items()]
+    ))
+    
+    def __init__(self, file_path: str, **kwargs):
         """Initialize the ESRF ID10 reader.
         
         Parameters
         ----------
         file_path : str
             Path to the ESRF ID10 file to read.
+        **kwargs
+            Chunk cache settings passed on to ``HDF5Reader``.
         """
-        super().__init__(file_path)
+        super().__init__(file_path, **kwargs)
         self.beamline = "ESRF ID10"
     
     def read(self) -> bool:
@@ -39,185 +209,110 @@ class ESRFID10Reader(HDF5Reader):
             if not self.is_open:
                 self.open()
             
-            # Read ID10-specific structure
-            self.read_id10_structure()
+            cached = self._load_cache()
+            if cached is not None:
+                # Metadata and data paths are unchanged since the last read
+                self.read_id10_structure(cached['structure'])
+                if self.BULK_LOAD:
+                    self.read_all_datasets(lazy=True)
+                self.metadata.update(cached['metadata'])
+                return True
             
-            # Also read all datasets and metadata
-            self.read_all_datasets()
-            self.read_metadata_to_dict()
+            # Resolve data and metadata paths together, then read
+            structure, metadata_paths = self._resolve_candidates()
+            self.read_id10_structure(structure)
+            
+            # Index the remaining datasets as lazy handles and read all
+            # attributes in one walk; nothing is read twice
+            if self.BULK_LOAD:
+                self.read_contents(lazy=True)
             
             # Extract and organize ID10-specific metadata
-            self.extract_id10_metadata()
+            self.extract_id10_metadata(metadata_paths)
             
+            self._save_cache({'structure': structure, 'metadata': self.metadata})
             return True
         except Exception as e:
             self.logger.error(f"Error reading ESRF ID10 file {self.file_path}: {e}")
             return False
     
-    def read_id10_structure(self):
-        """Read ESRF ID10-specific data structure."""
-        # Common ID10 data paths
-        id10_paths = {
-            'detector_data': [
-                '/entry/data/data',
-                '/entry/instrument/detector/data',
-                '/entry/data/maxipix_data',
-                '/data/data',
-                '/detector/data',
-            ],
-            'saxs_data': [
-                '/entry/data/saxs',
-                '/entry/result/saxs',
-                '/saxs/data',
-                '/saxs',
-            ],
-            'xpcs_data': [
-                '/entry/data/xpcs',
-                '/entry/result/xpcs',
-                '/xpcs/data',
-                '/xpcs',
-            ],
-            'g2_data': [
-                '/entry/result/g2',
-                '/entry/data/g2',
-                '/g2/data',
-                '/g2',
-                '/correlation/g2',
-            ],
-            'tau_data': [
-                '/entry/result/tau',
-                '/entry/data/tau',
-                '/tau/data',
-                '/tau',
-                '/correlation/tau',
-            ],
-            'twotime_data': [
-                '/entry/result/twotime',
-                '/entry/data/twotime',
-                '/twotime/data',
-                '/twotime',
-                '/correlation/twotime',
-            ],
-            'intensity_data': [
-                '/entry/result/intensity',
-                '/entry/data/intensity',
-                '/intensity/data',
-                '/intensity',
-            ],
-            'q_map': [
-                '/entry/result/q_map',
-                '/entry/data/q_map',
-                '/q_map/data',
-                '/q_map',
-            ],
-            'mask': [
-                '/entry/data/mask',
-                '/entry/instrument/detector/mask',
-                '/mask/data',
-                '/mask',
-            ],
-        }
+    def read_id10_structure(self, structure: Optional[Dict[str, str]] = None,
+                          lazy: bool = True) -> Dict[str, str]:
+        """Read ESRF ID10-specific data structure.
+        
+        By default matched datasets are stored as lazy handles and only read
+        when requested through one of the ``get_*`` methods.
         
-        for data_type, paths in id10_paths.items():
-            for path in paths:
-                data = self.read_dataset(path)
-                if data is not None:
-                    self.data[data_type] = data
-                    self.logger.debug(f"Read ID10 {data_type} from {path} with shape {data.shape}")
-                    break  # Use the first found path
+        Parameters
+        ----------
+        structure : Dict[str, str], optional
+            Previously resolved data paths, e.g. from the metadata cache. By
+            default the candidate paths are resolved against the file.
+        lazy : bool, optional
+            Store lazy handles instead of reading the arrays, by default True
+        
+        Returns
+        -------
+        Dict[str, str]
+            Dictionary mapping data types to the dataset paths used.
+        """
+        if structure is None:
+            structure = self._resolve_candidates()[0]
+        
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if lazy:
+            values = {path: self._lazy_dataset(path) for path in structure.values()}
+        else:
+            values = self._read_many(structure.values())
+        for data_type, path in structure.items():
+            data = values.get(path)
+            if data is not None:
+                self._set_data(data_type, data)
+                self._data_paths[data_type] = path
+                if debug:
+                    self.logger.debug("Read ID10 %s from %s with shape %s", data_type, path, data.shape)
+        
+        return structure
     
-    def extract_id10_metadata(self):
-        """Extract ESRF ID10-specific metadata."""
-        # Common ID10 metadata paths
-        metadata_paths = {
-            'beam_center_x': [
-                '/entry/instrument/detector/beam_center_x',
-                '/entry/data/beam_center_x',
-                '/beam_center_x',
-                '/detector/beam_center_x',
-            ],
-            'beam_center_y': [
-                '/entry/instrument/detector/beam_center_y',
-                '/entry/data/beam_center_y',
-                '/beam_center_y',
-                '/detector/beam_center_y',
-            ],
-            'detector_distance': [
-                '/entry/instrument/detector/distance',
-                '/entry/data/detector_distance',
-                '/detector_distance',
-                '/detector/distance',
-            ],
-            'wavelength': [
-                '/entry/instrument/source/wavelength',
-                '/entry/data/wavelength',
-                '/wavelength',
-                '/source/wavelength',
-            ],
-            'energy': [
-                '/entry/instrument/source/energy',
-                '/entry/data/energy',
-                '/energy',
-                '/source/energy',
-            ],
-            'pixel_size_x': [
-                '/entry/instrument/detector/x_pixel_size',
-                '/entry/data/pixel_size_x',
-                '/pixel_size_x',
-                '/detector/x_pixel_size',
-            ],
-            'pixel_size_y': [
-                '/entry/instrument/detector/y_pixel_size',
-                '/entry/data/pixel_size_y',
-                '/pixel_size_y',
-                '/detector/y_pixel_size',
-            ],
-            'exposure_time': [
-                '/entry/instrument/detector/count_time',
-                '/entry/data/exposure_time',
-                '/exposure_time',
-                '/detector/count_time',
-            ],
-            'frame_time': [
-                '/entry/instrument/detector/frame_time',
-                '/entry/data/frame_time',
-                '/frame_time',
-                '/detector/frame_time',
-            ],
-            'sample_name': [
-                '/entry/sample/name',
-                '/entry/data/sample_name',
-                '/sample_name',
-                '/sample/name',
-            ],
-            'sample_temperature': [
-                '/entry/sample/temperature',
-                '/entry/data/sample_temperature',
-                '/sample_temperature',
-                '/sample/temperature',
-            ],
-            'start_time': [
-                '/entry/start_time',
-                '/entry/data/start_time',
-                '/start_time',
-            ],
-            'end_time': [
-                '/entry/end_time',
-                '/entry/data/end_time',
-                '/end_time',
-            ],
-        }
+    def _resolve_candidates(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Resolve the data and metadata candidate paths in one pass.
+        
+        Returns
+        -------
+        Tuple[Dict[str, str], Dict[str, str]]
+            Data types and metadata keys mapped to the paths found.
+        """
+        resolved = {'data': {}, 'metadata': {}}
+        for (kind, key), path in self._resolve_paths(self._CANDIDATES).items():
+            resolved[kind][key] = path
+        return resolved['data'], resolved['metadata']
+    
+    def extract_id10_metadata(self, paths: Optional[Dict[str, str]] = None):
+        """Extract ESRF ID10-specific metadata.
+        
+        Without ``BULK_LOAD``, attributes are only collected from the root
+        group and from the data and metadata datasets read and their parents.
+        
+        Parameters
+        ----------
+        paths : Dict[str, str], optional
+            Previously resolved metadata paths. By default the candidate
+            paths are resolved against the file.
+        """
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if paths is None:
+            paths = self._resolve_candidates()[1]
+        if not self.BULK_LOAD:
+            self.read_path_attributes(list(self._data_paths.values()) + list(paths.values()))
         
-        for key, paths in metadata_paths.items():
-            for path in paths:
-                data = self.read_dataset(path)
-                if data is not None:
-                    # Handle scalar values
-                    if isinstance(data, np.ndarray) and data.size == 1:
-                        data = data.item()
-                    self.metadata[key] = data
-                    self.logger.debug(f"Read ID10 metadata {key}: {data}")
-                    break  # Use the first found path
+        values = self._read_values(paths.values())
+        for key, path in paths.items():
+            data = values.get(path)
+            if data is None:
+                continue
+            self.metadata[key] = data
+            if debug:
+                self.logger.debug("Read ID10 metadata %s: %s", key, data)
         
         # Add beamline information
         self.metadata['beamline'] = self.beamline
@@ -235,38 +330,59 @@ class ESRFID10Reader(HDF5Reader):
         saxs_keys = ['saxs_data', 'detector_data', 'data']
         for key in saxs_keys:
             if key in self.data:
-                return self.data[key]
+                return self._materialize(self.data[key])
         return None
     
-    def get_xpcs_data(self) -> Dict[str, Optional[np.ndarray]]:
+    def get_frame(self, index: int = 0) -> Optional[np.ndarray]:
+        """Get a single detector frame.
+        
+        Only the requested frame of an image stack is read from the file.
+        
+        Parameters
+        ----------
+        index : int, optional
+            Frame index into an image stack, by default 0. Ignored for a
+            single 2D image.
+        
+        Returns
+        -------
+        Optional[np.ndarray]
+            2D frame, or None if not found.
+        """
+        for key in ['saxs_data', 'detector_data', 'data']:
+            if key in self.data:
+                data = self.data[key]
+                if getattr(data, 'ndim', 0) >= 3:
+                    return np.asarray(data[index])
+                return self._materialize(data)
+        return None
+    
+    def get_xpcs_data(self, keys: Optional[Sequence[str]] = None) -> Dict[str, Optional[np.ndarray]]:
         """Get XPCS data.
         
+        Parameters
+        ----------
+        keys : Sequence[str], optional
+            XPCS keys to read, e.g. ('g2', 'tau'), by default all of
+            XPCS_KEYS
+        
         Returns
         -------
         Dict[str, Optional[np.ndarray]]
             Dictionary containing XPCS data arrays.
         """
-        xpcs_data = {}
-        
-        # Get g2 data
-        if 'g2_data' in self.data:
-            xpcs_data['g2'] = self.data['g2_data']
+        if keys is None:
+            keys = self.XPCS_KEYS
         
-        # Get tau data
-        if 'tau_data' in self.data:
-            xpcs_data['tau'] = self.data['tau_data']
+        # Read all pending correlation datasets in one batch; siblings such
+        # as g2, tau and twotime usually sit next to each other in the file
+        self._materialize_many([f'{key}_data' for key in keys])
         
-        # Get two-time correlation data
-        if 'twotime_data' in self.data:
-            xpcs_data['twotime'] = self.data['twotime_data']
-        
-        # Get intensity data
-        if 'intensity_data' in self.data:
-            xpcs_data['intensity'] = self.data['intensity_data']
-        
-        # Get XPCS data (if available as a single dataset)
-        if 'xpcs_data' in self.data:
-            xpcs_data['xpcs'] = self.data['xpcs_data']
+        xpcs_data = {}
+        for key in keys:
+            data_key = f'{key}_data'
+            if data_key in self.data:
+                xpcs_data[key] = self._materialize(self.data[data_key])
         
         return xpcs_data
     
@@ -278,7 +394,7 @@ class ESRFID10Reader(HDF5Reader):
         Optional[np.ndarray]
             Q-map array, or None if not found.
         """
-        return self.data.get('q_map')
+        return self._materialize(self.data.get('q_map'))
     
     def get_mask(self) -> Optional[np.ndarray]:
         """Get mask data.
@@ -288,59 +404,38 @@ class ESRFID10Reader(HDF5Reader):
         Optional[np.ndarray]
             Mask array, or None if not found.
         """
-        return self.data.get('mask')
+        return self._materialize(self.data.get('mask'))
     
     @classmethod
-    def can_read(cls, file_path: str) -> bool:
-        """Check if the file can be read by this reader.
+    def can_read_from_index(cls, names: Container[str], attrs: Dict[str, Any]) -> bool:
+        """Check if a probed file can be read by this reader.
         
         Parameters
         ----------
-        file_path : str
-            Path to the file to check.
+        names : Container[str]
+            Membership test for absolute object paths in the file.
+        attrs : Dict[str, Any]
+            Root attributes of the file.
         
         Returns
         -------
         bool
             True if the file can be read by this reader, False otherwise.
         """
-        try:
-            # First check if it's a valid HDF5 file
-            if not super().can_read(file_path):
-                return False
-            
-            # Check for ID10-specific structure
-            import h5py
-            with h5py.File(file_path, 'r') as f:
-                # Look for ID10-specific paths or attributes
-                id10_indicators = [
-                    '/entry/data/maxipix_data',
-                    '/entry/instrument/detector/maxipix',
-                    '/detector/data',
-                    '/correlation/g2',
-                ]
-                
-                for indicator in id10_indicators:
-                    if indicator in f:
-                        return True
-                
-                # Check for ID10-specific attributes
-                if 'beamline' in f.attrs:
-                    beamline = f.attrs['beamline']
-                    if isinstance(beamline, bytes):
-                        beamline = beamline.decode('utf-8')
-                    if 'ID10' in str(beamline).upper():
-                        return True
-                
-                # Check for ESRF-specific attributes
-                if 'facility' in f.attrs:
-                    facility = f.attrs['facility']
-                    if isinstance(facility, bytes):
-                        facility = facility.decode('utf-8')
-                    if 'ESRF' in str(facility).upper():
-                        return True
-                
-                return False
-        except Exception:
-            return False
-
+        # Check the beamline and facility attributes first, as they need no
+        # lookups in the file; exact tags are a set lookup, anything else
+        # falls back to a substring test
+        for name, tags, keyword in (('beamline', _ID10_TAGS, 'ID10'),
+                                    ('facility', _ESRF_TAGS, 'ESRF')):
+            value = attrs.get(name)
+            if not isinstance(value, (str, bytes)):
+                continue
+            if value in tags:
+                return True
+            if isinstance(value, bytes):
+                value = value.decode('utf-8', errors='replace')
+            if keyword in value.upper():
+                return True
+        
+        # Look for ID10-specific paths
+        return any(indicator in names for indicator in _ID10_INDICATORS)
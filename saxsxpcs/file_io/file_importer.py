@@ -7,14 +7,19 @@ File importer factory and format detector for SAXS and XPCS data.
 
 import os
 import logging
-from typing import Dict, List, Optional, Type, Any
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Type, Any
 
 from .base_reader import BaseReader
-from .hdf5_reader import HDF5Reader
+from .hdf5_reader import HDF5Reader, HDF5_EXTENSIONS
 from .nexus_reader import NeXusReader
 from .beamlines.desy_p10 import DESYP10Reader
 from .beamlines.esrf_id02 import ESRFID02Reader
 from .beamlines.esrf_id10 import ESRFID10Reader
+from ..config import DEFAULT_SETTINGS
 from ..utils.logging_config import LoggerMixin
 
 logger = logging.getLogger(__name__)
@@ -31,33 +36,103 @@ class FileFormatDetector(LoggerMixin):
         HDF5Reader,  # Keep as fallback
     ]
     
+    # Detection results per file version, most recently used last
+    DETECT_CACHE_SIZE = 1024
+    _format_cache = OrderedDict()
+    _format_cache_lock = threading.Lock()
+    
     @classmethod
-    def detect_format(cls, file_path: str) -> Optional[Type[BaseReader]]:
+    def detect_format(cls, file_path: str, h5_file: Optional[Any] = None) -> Optional[Type[BaseReader]]:
         """Detect the file format and return the appropriate reader class.
         
+        Results are cached per file version (path, modification time and
+        size); the file, or the given handle, is only probed on a cache miss.
+        
         Parameters
         ----------
         file_path : str
             Path to the file to analyze.
+        h5_file : h5py.File, optional
+            Already open handle on the file, probed instead of opening the
+            file again.
         
         Returns
         -------
         Optional[Type[BaseReader]]
             Reader class that can handle the file, or None if no suitable reader found.
         """
-        if not os.path.exists(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
             logger.error(f"File not found: {file_path}")
             return None
         
-        # Try each reader in order of specificity
-        for reader_class in cls.READERS:
-            try:
-                if reader_class.can_read(file_path):
-                    logger.debug(f"File {file_path} can be read by {reader_class.__name__}")
-                    return reader_class
-            except Exception as e:
-                logger.debug(f"Error checking {reader_class.__name__} for {file_path}: {e}")
-                continue
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+        found, reader_class = cls._cache_lookup(key)
+        if found:
+            return reader_class
+        
+        reader_class = cls._detect_format(file_path, h5_file)
+        
+        with cls._format_cache_lock:
+            cls._format_cache[key] = reader_class
+            if len(cls._format_cache) > cls.DETECT_CACHE_SIZE:
+                cls._format_cache.popitem(last=False)
+        return reader_class
+    
+    @classmethod
+    def lookup_format(cls, file_path: str) -> Tuple[bool, Optional[Type[BaseReader]]]:
+        """Look up the cached detection result for the current file version.
+        
+        Parameters
+        ----------
+        file_path : str
+            Path to the file.
+        
+        Returns
+        -------
+        Tuple[bool, Optional[Type[BaseReader]]]
+            Whether a result is cached, and the cached reader class (None if
+            no reader accepted the file).
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False, None
+        return cls._cache_lookup((file_path, stat.st_mtime_ns, stat.st_size))
+    
+    @classmethod
+    def _cache_lookup(cls, key: Tuple[str, int, int]) -> Tuple[bool, Optional[Type[BaseReader]]]:
+        """Look up a detection result by cache key, marking it recently used."""
+        with cls._format_cache_lock:
+            if key in cls._format_cache:
+                cls._format_cache.move_to_end(key)
+                return True, cls._format_cache[key]
+        return False, None
+    
+    @classmethod
+    def _detect_format(cls, file_path: str, h5_file: Optional[Any] = None) -> Optional[Type[BaseReader]]:
+        """Probe the file and return the first reader accepting it."""
+        if not file_path.lower().endswith(HDF5_EXTENSIONS):
+            logger.warning(f"No suitable reader found for file: {file_path}")
+            return None
+        
+        # Sniff the signature, then open the file once and let every reader
+        # decide from the same root attributes and path lookups
+        with HDF5Reader.probe_file(file_path, h5_file) as probe:
+            if probe is None:
+                logger.warning(f"No suitable reader found for file: {file_path}")
+                return None
+            
+            # Try each reader in order of specificity
+            for reader_class in cls.READERS:
+                try:
+                    if reader_class.can_read_from_index(*probe):
+                        logger.debug(f"File {file_path} can be read by {reader_class.__name__}")
+                        return reader_class
+                except Exception as e:
+                    logger.debug(f"Error checking {reader_class.__name__} for {file_path}: {e}")
+                    continue
         
         logger.warning(f"No suitable reader found for file: {file_path}")
         return None
@@ -90,25 +165,89 @@ class FileImporterFactory(LoggerMixin):
         Optional[BaseReader]
             Reader instance, or None if no suitable reader found.
         """
-        reader_class = FileFormatDetector.detect_format(file_path)
+        # Files already found unreadable in their current version are not
+        # opened again
+        cached, reader_class = FileFormatDetector.lookup_format(file_path)
+        if cached and reader_class is None:
+            logger.debug(f"No suitable reader found for file: {file_path}")
+            return None
+        
+        # Open the file once and hand the open file on to the reader, instead
+        # of opening it again in read(); on a cache miss the same handle is
+        # probed for detection
+        h5_file = None
+        if file_path.lower().endswith(HDF5_EXTENSIONS) and HDF5Reader.has_hdf5_signature(file_path):
+            try:
+                h5_file = HDF5Reader.open_h5(file_path)
+            except Exception as e:
+                logger.debug(f"Could not open {file_path} for detection: {e}")
+        
+        if not cached:
+            reader_class = FileFormatDetector.detect_format(file_path, h5_file)
         if reader_class is None:
+            if h5_file is not None:
+                h5_file.close()
             return None
         
         try:
-            reader = reader_class(file_path)
+            reader = reader_class(file_path, h5_file=h5_file)
             logger.debug(f"Created {reader_class.__name__} for {file_path}")
             return reader
         except Exception as e:
             logger.error(f"Error creating reader for {file_path}: {e}")
+            if h5_file is not None:
+                h5_file.close()
             return None
 
+def _open_and_extract(file_path: str) -> Optional[Dict[str, Any]]:
+    """Import a file in a worker process and return its picklable state.
+    
+    Live readers hold an h5py file handle and cannot be sent back to the
+    parent process, so the worker returns the reader class name together with
+    the state exported by the reader.
+    
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to import.
+    
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        Dictionary with 'reader_class' and 'state' entries, or None if the
+        import failed.
+    """
+    reader = FileImporterFactory.create_reader(file_path)
+    if reader is None:
+        return None
+    
+    try:
+        if not reader.read():
+            return None
+        return {
+            'reader_class': reader.__class__.__name__,
+            'state': reader.export_state(),
+        }
+    finally:
+        reader.close()
+
 class FileImporter(LoggerMixin):
     """Main file importer class for SAXS and XPCS data."""
     
+    # Upper bound on import threads when multiprocessing is not used
+    MAX_IMPORT_THREADS = 8
+    
+    # Smallest batches imported in a process pool when multiprocessing is
+    # enabled, by file count or total size; starting the pool and reopening
+    # every file afterwards costs more than it saves on smaller batches
+    PROCESS_MIN_FILES = 16
+    PROCESS_MIN_BYTES = 1024 ** 3
+    
     def __init__(self):
         """Initialize the file importer."""
         self.readers: Dict[str, BaseReader] = {}
         self.factory = FileImporterFactory()
+        self._lock = threading.Lock()
     
     def import_file(self, file_path: str) -> Optional[BaseReader]:
         """Import a single file.
@@ -138,37 +277,160 @@ class FileImporter(LoggerMixin):
                 return None
             
             # Store the reader
-            self.readers[file_path] = reader
+            with self._lock:
+                self.readers[file_path] = reader
             self.logger.info(f"Successfully imported {file_path}")
             return reader
-            
+        
         except Exception as e:
             self.logger.error(f"Error importing file {file_path}: {e}")
             return None
     
-    def import_files(self, file_paths: List[str]) -> Dict[str, BaseReader]:
+    def import_files(self, file_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, BaseReader]:
         """Import multiple files.
         
+        See ``iter_import`` for how the files are read.
+        
         Parameters
         ----------
         file_paths : List[str]
             List of file paths to import.
+        max_workers : int, optional
+            Maximum number of workers, by default the 'max_workers'
+            processing setting (all cores if None); threads are capped at
+            MAX_IMPORT_THREADS
         
         Returns
         -------
         Dict[str, BaseReader]
             Dictionary mapping file paths to reader instances.
         """
-        imported_readers = {}
-        
-        for file_path in file_paths:
-            reader = self.import_file(file_path)
-            if reader is not None:
-                imported_readers[file_path] = reader
+        imported_readers = {
+            file_path: reader
+            for file_path, reader in self.iter_import(file_paths, max_workers)
+            if reader is not None
+        }
         
         self.logger.info(f"Successfully imported {len(imported_readers)} out of {len(file_paths)} files")
         return imported_readers
     
+    def iter_import(self, file_paths: List[str], max_workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[BaseReader]]]:
+        """Import multiple files, yielding each result as it becomes available.
+        
+        When multiprocessing is enabled in the processing settings and the
+        batch reaches PROCESS_MIN_FILES files or PROCESS_MIN_BYTES, files are
+        detected and read in a process pool (each worker has its own HDF5
+        library instance) and the readers are rebuilt here from the returned
+        state. Otherwise a thread pool overlaps the parts of the import that
+        run outside the HDF5 library, such as file system calls.
+        
+        Parameters
+        ----------
+        file_paths : List[str]
+            List of file paths to import.
+        max_workers : int, optional
+            Maximum number of workers, by default the 'max_workers'
+            processing setting (all cores if None); threads are capped at
+            MAX_IMPORT_THREADS
+        
+        Yields
+        ------
+        Tuple[str, Optional[BaseReader]]
+            File path and reader instance, in the order of ``file_paths``;
+            the reader is None if the import failed.
+        """
+        processing = DEFAULT_SETTINGS['processing']
+        if max_workers is None:
+            max_workers = processing['max_workers'] or os.cpu_count() or 1
+        max_workers = min(len(file_paths), max_workers)
+        
+        if (processing['use_multiprocessing'] and max_workers > 1
+                and self._worth_processes(file_paths)):
+            yield from self._iter_import_parallel(file_paths, max_workers)
+        elif max_workers > 1:
+            threads = min(max_workers, self.MAX_IMPORT_THREADS)
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                futures = [executor.submit(self.import_file, file_path) for file_path in file_paths]
+                try:
+                    for file_path, future in zip(file_paths, futures):
+                        yield file_path, future.result()
+                finally:
+                    # Files not started yet are skipped if the caller stops early
+                    for future in futures:
+                        future.cancel()
+        else:
+            for file_path in file_paths:
+                yield file_path, self.import_file(file_path)
+    
+    def _worth_processes(self, file_paths: List[str]) -> bool:
+        """Check if a batch is large enough for a process pool.
+        
+        Parameters
+        ----------
+        file_paths : List[str]
+            List of file paths to import.
+        
+        Returns
+        -------
+        bool
+            True if the batch has at least PROCESS_MIN_FILES files or
+            PROCESS_MIN_BYTES in total, False otherwise.
+        """
+        if len(file_paths) >= self.PROCESS_MIN_FILES:
+            return True
+        
+        total_bytes = 0
+        for file_path in file_paths:
+            try:
+                total_bytes += os.path.getsize(file_path)
+            except OSError:
+                continue
+        return total_bytes >= self.PROCESS_MIN_BYTES
+    
+    def _iter_import_parallel(self, file_paths: List[str], max_workers: int) -> Iterator[Tuple[str, Optional[BaseReader]]]:
+        """Import files in a process pool.
+        
+        Parameters
+        ----------
+        file_paths : List[str]
+            List of file paths to import.
+        max_workers : int
+            Number of worker processes.
+        
+        Yields
+        ------
+        Tuple[str, Optional[BaseReader]]
+            File path and reader instance, or None if the import failed.
+        """
+        reader_classes = {cls.__name__: cls for cls in FileFormatDetector.READERS}
+        
+        # Use spawn so workers never inherit HDF5 library state from this process
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = [executor.submit(_open_and_extract, file_path) for file_path in file_paths]
+            try:
+                for file_path, future in zip(file_paths, futures):
+                    reader = None
+                    try:
+                        result = future.result()
+                        if result is None:
+                            self.logger.error(f"Failed to import file {file_path}")
+                        else:
+                            reader = reader_classes[result['reader_class']](file_path)
+                            reader.restore_state(result['state'])
+                            
+                            with self._lock:
+                                self.readers[file_path] = reader
+                            self.logger.info(f"Successfully imported {file_path}")
+                    except Exception as e:
+                        self.logger.error(f"Error importing file {file_path}: {e}")
+                        reader = None
+                    yield file_path, reader
+            finally:
+                # Files not started yet are skipped if the caller stops early
+                for future in futures:
+                    future.cancel()
+    
     def get_reader(self, file_path: str) -> Optional[BaseReader]:
         """Get the reader for a specific file.
         
@@ -250,14 +512,16 @@ class FileImporter(LoggerMixin):
         for file_path, reader in self.readers.items():
             file_info = reader.get_file_info()
             metadata = reader.get_metadata()
-            data = reader.get_data()
             
+            # Shapes come from the specs recorded when the data was stored,
+            # so no data entry is touched here
+            specs = reader.data_specs
             file_summary = {
                 'file_info': file_info,
                 'beamline': metadata.get('beamline', 'Unknown'),
                 'facility': metadata.get('facility', 'Unknown'),
-                'data_types': list(data.keys()),
-                'data_shapes': {key: getattr(value, 'shape', 'N/A') for key, value in data.items()},
+                'data_types': list(specs),
+                'data_shapes': {key: 'N/A' if spec.shape is None else spec.shape for key, spec in specs.items()},
             }
             
             summary['files'][file_path] = file_summary
@@ -5,41 +5,308 @@
 HDF5 file reader for SAXS and XPCS data.
 """
 
+import os
+import codecs
 import logging
 import numpy as np
-from typing import Dict, Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Container, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
 import h5py
 
 from .base_reader import BaseReader
 
 logger = logging.getLogger(__name__)
 
+# Extensions handled by the HDF5-based readers
+HDF5_EXTENSIONS = ('.h5', '.hdf5', '.nxs', '.nx')
+
+# Format signature at the start of the superblock, which sits at offset 0 or,
+# after a user block, at 512, 1024, 2048, ...
+HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+
+# Files are only ever opened read-only, so HDF5 file locking is switched off
+# where supported (h5py >= 3.5 with HDF5 >= 1.10.7 / 1.12.1); it only adds
+# lock contention between threads and fails on some network filesystems
+_HDF5_VERSION = h5py.version.hdf5_version_tuple[:3]
+if h5py.version.version_tuple[:2] >= (3, 5) and (
+        _HDF5_VERSION >= (1, 12, 1) or (1, 10, 7) <= _HDF5_VERSION < (1, 11, 0)):
+    FILE_KWARGS = {'locking': False}
+else:
+    FILE_KWARGS = {}
+
+# Largest gap between two contiguous datasets that is read through rather
+# than split into separate reads
+COALESCE_GAP = 64 * 1024
+
+# Worker threads for reading separate runs of coalesced datasets; the raw
+# file reads release the GIL, unlike h5py calls, which hold a global lock
+READ_WORKERS = 4
+_read_pool = None
+
+# Default raw data chunk cache: large enough to keep full detector chunks
+# cached, with a prime number of hash slots
+RDCC_NBYTES = 256 * 1024 * 1024
+RDCC_NSLOTS = 50021
+RDCC_W0 = 0.75
+
+# Files below this size are loaded into memory on open with in_memory='auto'
+IN_MEMORY_MAX_BYTES = 2 * 1024 ** 3
+
+# Smallest contiguous dataset memory-mapped instead of read; every map holds
+# a file descriptor and outlives close(), which does not pay off for small data
+MMAP_MIN_BYTES = 1024 * 1024
+
+# Translation table flattening HDF5 paths into data and metadata keys
+_SLASH_TABLE = str.maketrans('/', '_')
+
+# Metadata cache settings applied on open: the library maxima for cache size
+# and for the number of epochs an unused entry survives, so that object
+# headers of files with thousands of small groups are not evicted and re-read
+# while attributes are collected
+MDC_MAX_SIZE = 128 * 1024 * 1024
+MDC_INITIAL_SIZE = 16 * 1024 * 1024
+MDC_EPOCHS_BEFORE_EVICTION = 10
+
+# Bound UTF-8 decoder for scalar bytes attributes
+_decode_utf8 = codecs.getdecoder('utf-8')
+
+def _decode_attribute(value: Any) -> Any:
+    """Convert a bytes or string-array attribute value to Python strings.
+    
+    String arrays are decoded in one vectorized call and returned as (nested)
+    lists of str; other values are returned unchanged.
+    """
+    if isinstance(value, bytes):
+        return _decode_utf8(value)[0]
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'SU':
+        if value.dtype.kind == 'S':
+            value = np.char.decode(value, 'utf-8')
+        return value.tolist()
+    return value
+
+class _LazyDataset:
+    """Deferred handle on an HDF5 dataset.
+    
+    Only the ``h5py.Dataset`` reference is kept; the array is read on the
+    first ``materialize()`` call and cached. ``shape``, ``dtype``, ``ndim``
+    and ``size`` are answered from the dataset without reading it, and
+    indexing reads only the requested selection.
+    """
+    
+    __slots__ = ('_dset', '_read_func', '_arr')
+    
+    def __init__(self, dset: h5py.Dataset, read_func=None):
+        """Initialize the lazy dataset.
+        
+        Parameters
+        ----------
+        dset : h5py.Dataset
+            Dataset to wrap.
+        read_func : callable, optional
+            Function reading the full dataset into an array, by default
+            ``dset[()]``.
+        """
+        self._dset = dset
+        self._read_func = read_func
+        self._arr = None
+    
+    def materialize(self) -> np.ndarray:
+        """Read the dataset (once) and return it as an array."""
+        if self._arr is None:
+            if self._read_func is not None:
+                self._arr = self._read_func(self._dset)
+            else:
+                self._arr = self._dset[()]
+        return self._arr
+    
+    @property
+    def name(self):
+        return self._dset.name
+    
+    @property
+    def shape(self):
+        return self._dset.shape
+    
+    @property
+    def dtype(self):
+        return self._dset.dtype if self._arr is None else self._arr.dtype
+    
+    @property
+    def ndim(self):
+        return self._dset.ndim
+    
+    @property
+    def size(self):
+        return self._dset.size
+    
+    def __len__(self):
+        return len(self._dset)
+    
+    def __getitem__(self, key):
+        if self._arr is not None:
+            return self._arr[key]
+        return self._dset[key]
+    
+    def __array__(self, dtype=None, copy=None):
+        arr = self.materialize()
+        if dtype is not None:
+            arr = arr.astype(dtype, copy=False)
+        return arr
+    
+    def __repr__(self):
+        return f"<lazy dataset {self._dset.name} shape={self.shape} dtype={self.dtype}>"
+
+class _PathProbe:
+    """Membership test for object paths in an open file.
+    
+    Each ``path in probe`` is a single link lookup on the file (memoized),
+    so format detection never walks the whole hierarchy.
+    """
+    
+    __slots__ = ('_file', '_seen')
+    
+    def __init__(self, h5_file: h5py.File):
+        self._file = h5_file
+        self._seen = {}
+    
+    def __contains__(self, path):
+        found = self._seen.get(path)
+        if found is None:
+            try:
+                found = path in self._file
+            except Exception:
+                found = False
+            self._seen[path] = found
+        return found
+
 class HDF5Reader(BaseReader):
     """Reader for HDF5 files."""
     
-    def __init__(self, file_path: str):
+    # Whether read() loads every dataset in the file; readers that know which
+    # paths they need switch this off
+    BULK_LOAD = True
+    
+    def __init__(self, file_path: str, rdcc_nbytes: int = RDCC_NBYTES,
+                 rdcc_nslots: int = RDCC_NSLOTS, rdcc_w0: float = RDCC_W0,
+                 in_memory: Union[bool, str] = False, h5_file: Optional[h5py.File] = None):
         """Initialize the HDF5 reader.
         
         Parameters
         ----------
         file_path : str
             Path to the HDF5 file to read.
+        rdcc_nbytes : int, optional
+            Raw data chunk cache size in bytes, by default 256 MiB so that
+            full detector chunks stay cached
+        rdcc_nslots : int, optional
+            Number of chunk cache hash slots, a prime, by default 50021
+        rdcc_w0 : float, optional
+            Chunk cache preemption policy, by default 0.75
+        in_memory : bool or str, optional
+            Load the whole file into memory on open (HDF5 ``core`` driver), so
+            later reads involve no system calls. ``'auto'`` does so for files
+            smaller than ``IN_MEMORY_MAX_BYTES``. By default False
+        h5_file : h5py.File, optional
+            Handle on the file that is already open, e.g. from format
+            detection; ``open()`` adopts it instead of opening the file again
+            if it was opened with the driver and chunk cache settings above,
+            and otherwise closes it.
         """
         super().__init__(file_path)
+        self.in_memory = in_memory
+        self._h5_file = h5_file
         self.file = None
+        self._index = None
+        self._group_index = {}
+        self._data_paths = {}
+        self._rdcc = {
+            'rdcc_nbytes': rdcc_nbytes,
+            'rdcc_nslots': rdcc_nslots,
+            'rdcc_w0': rdcc_w0,
+        }
     
     def open(self):
         """Open the HDF5 file for reading."""
         try:
-            self.file = h5py.File(self.file_path, 'r')
+            self.file = None
+            if self._h5_file is not None:
+                # Adopt the handle passed in at construction if it is still
+                # open with this reader's settings; otherwise open anew
+                if self._h5_file.id.valid and self._matches_settings(self._h5_file):
+                    self.file = self._h5_file
+                else:
+                    self._h5_file.close()
+                self._h5_file = None
+            if self.file is None and self._use_core_driver():
+                try:
+                    self.file = h5py.File(self.file_path, 'r', libver='latest', driver='core',
+                                          backing_store=False, **FILE_KWARGS, **self._rdcc)
+                except Exception as e:
+                    self.logger.debug(f"In-memory open failed for {self.file_path}, using default driver: {e}")
+            if self.file is None:
+                self.file = h5py.File(self.file_path, 'r', libver='latest', **FILE_KWARGS, **self._rdcc)
+            self._configure_metadata_cache()
             self.is_open = True
             self.logger.debug(f"Opened HDF5 file: {self.file_path}")
         except Exception as e:
             self.logger.error(f"Error opening HDF5 file {self.file_path}: {e}")
             raise
     
+    def _matches_settings(self, h5_file: h5py.File) -> bool:
+        """Check if an open file has this reader's driver and chunk cache.
+        
+        Parameters
+        ----------
+        h5_file : h5py.File
+            Open file handle.
+        
+        Returns
+        -------
+        bool
+            True if the handle can be used as if opened by this reader.
+        """
+        try:
+            if (h5_file.driver == 'core') != self._use_core_driver():
+                return False
+            _, nslots, nbytes, w0 = h5_file.id.get_access_plist().get_cache()
+        except Exception as e:
+            self.logger.debug(f"Could not check the settings of {self.file_path}: {e}")
+            return False
+        rdcc = self._rdcc
+        return (nslots == rdcc['rdcc_nslots'] and nbytes == rdcc['rdcc_nbytes']
+                and abs(w0 - rdcc['rdcc_w0']) < 1e-9)
+    
+    def _use_core_driver(self) -> bool:
+        """Whether open() loads the file into memory."""
+        if self.in_memory == 'auto':
+            try:
+                return os.path.getsize(self.file_path) < IN_MEMORY_MAX_BYTES
+            except OSError:
+                return False
+        return bool(self.in_memory)
+    
+    def _configure_metadata_cache(self):
+        """Enlarge the metadata cache of the open file.
+        
+        Failure is not fatal; the file is then read with the default cache.
+        """
+        try:
+            config = self.file.id.get_mdc_config()
+            config.max_size = MDC_MAX_SIZE
+            config.set_initial_size = True
+            config.initial_size = MDC_INITIAL_SIZE
+            config.epochs_before_eviction = MDC_EPOCHS_BEFORE_EVICTION
+            self.file.id.set_mdc_config(config)
+        except Exception as e:
+            self.logger.debug(f"Could not configure metadata cache for {self.file_path}: {e}")
+    
     def close(self):
         """Close the HDF5 file."""
+        if self._h5_file is not None:
+            # A handle passed in but never adopted by open()
+            self._h5_file.close()
+            self._h5_file = None
         if self.file is not None:
             try:
                 self.file.close()
@@ -49,6 +316,119 @@ class HDF5Reader(BaseReader):
                 self.logger.error(f"Error closing HDF5 file {self.file_path}: {e}")
             finally:
                 self.file = None
+                self._index = None
+                self._group_index = {}
+    
+    @contextmanager
+    def open_file(self) -> Iterator[h5py.File]:
+        """Provide the open HDF5 file, opening it first if needed.
+        
+        The file stays open afterwards, as lazy dataset handles read from it;
+        ``close()`` releases it.
+        
+        Yields
+        ------
+        h5py.File
+            Open file handle.
+        """
+        if not self.is_open:
+            self.open()
+        yield self.file
+    
+    def safe_read_dataset(self, dataset: h5py.Dataset) -> Any:
+        """Read a dataset, returning single values as Python scalars.
+        
+        Bytes values are decoded to str.
+        
+        Parameters
+        ----------
+        dataset : h5py.Dataset
+            Dataset to read.
+        
+        Returns
+        -------
+        Any
+            Value or array read, or None if the read failed.
+        """
+        try:
+            value = self._read_array(dataset)
+            if value.size == 1:
+                value = value.item()
+            return _decode_attribute(value)
+        except Exception as e:
+            self.logger.error(f"Error reading dataset {dataset.name}: {e}")
+            return None
+    
+    @property
+    def _name_index(self) -> Dict[str, h5py.Dataset]:
+        """Dataset index of the open file, built on first use."""
+        if self.file is None:
+            return {}
+        if self._index is None:
+            self._index = self._build_name_index()
+        return self._index
+    
+    def _get_dataset(self, path: str) -> Optional[h5py.Dataset]:
+        """Look up a dataset by absolute path.
+        
+        Uses the dataset index once it has been built; before that the path is
+        looked up directly, so a few known paths (e.g. from the metadata cache)
+        don't force a walk of the whole file.
+        
+        Parameters
+        ----------
+        path : str
+            Absolute path to the dataset.
+        
+        Returns
+        -------
+        Optional[h5py.Dataset]
+            The dataset, or None if not found.
+        """
+        if self._index is not None or self.file is None:
+            return self._name_index.get(path)
+        obj = self.file.get(path)
+        return obj if isinstance(obj, h5py.Dataset) else None
+    
+    def _build_name_index(self) -> Dict[str, h5py.Dataset]:
+        """Walk the file once and map absolute dataset paths to datasets.
+        
+        Candidate-path probing in the beamline readers resolves against this
+        index, so a missing path costs a dict lookup instead of an HDF5 name
+        lookup. Groups met on the walk are kept in ``_group_index``.
+        
+        Returns
+        -------
+        Dict[str, h5py.Dataset]
+            Dictionary mapping absolute paths to datasets.
+        """
+        index = {}
+        groups = self._group_index = {}
+        
+        # Groups are recorded on the same walk for attribute lookups
+        def visit_func(name, obj):
+            if isinstance(obj, h5py.Dataset):
+                index['/' + name] = obj
+            else:
+                groups['/' + name] = obj
+        
+        self.file.visititems(visit_func)
+        
+        # visititems only follows hard links; NeXus files commonly alias
+        # datasets through soft links (e.g. /entry/data/data)
+        if hasattr(self.file, 'visititems_links'):
+            def link_func(name, link):
+                if isinstance(link, h5py.SoftLink) and '/' + name not in index:
+                    try:
+                        obj = self.file[name]
+                    except KeyError:
+                        return None  # dangling link
+                    if isinstance(obj, h5py.Dataset):
+                        index['/' + name] = obj
+            
+            self.file.visititems_links(link_func)
+        
+        return index
     
     def read(self) -> bool:
         """Read data from the HDF5 file.
@@ -63,7 +443,8 @@ class HDF5Reader(BaseReader):
                 self.open()
             
             # Read all datasets and attributes
-            self.read_all_datasets()
+            if self.BULK_LOAD:
+                self.read_all_datasets()
             self.read_metadata_to_dict()
             
             return True
@@ -85,22 +466,404 @@ class HDF5Reader(BaseReader):
             Dataset as numpy array, or None if not found.
         """
         try:
-            if path in self.file:
-                dataset = self.file[path]
-                if isinstance(dataset, h5py.Dataset):
-                    data = dataset[...]
-                    self.logger.debug(f"Read dataset {path} with shape {data.shape}")
-                    return data
-                else:
-                    self.logger.warning(f"Path {path} is not a dataset")
-                    return None
+            if not path.startswith('/'):
+                path = '/' + path
+            dataset = self._get_dataset(path)
+            if dataset is not None:
+                data = self._read_array(dataset)
+                self.logger.debug("Read dataset %s with shape %s", path, data.shape)
+                return data
             else:
-                self.logger.debug(f"Dataset {path} not found in file")
+                self.logger.debug("Dataset %s not found in file", path)
                 return None
         except Exception as e:
             self.logger.error(f"Error reading dataset {path}: {e}")
             return None
     
+    def _read_values(self, paths: Sequence[str]) -> Dict[str, Any]:
+        """Read metadata datasets, returning single values as Python scalars.
+        
+        Parameters
+        ----------
+        paths : Sequence[str]
+            Absolute paths to the datasets.
+        
+        Returns
+        -------
+        Dict[str, Any]
+            Dictionary mapping paths to Python scalars for single-element
+            datasets and numpy arrays otherwise. Paths not found are left out.
+        """
+        values = self._read_many(paths)
+        for path, data in values.items():
+            if data.size == 1:
+                values[path] = data.item()
+        return values
+    
+    def _read_many(self, paths: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Read several datasets, merging neighbouring ones into single reads.
+        
+        Contiguous, unfiltered datasets of plain numeric or fixed-length
+        string type are sorted by file offset; runs separated by no more than
+        ``COALESCE_GAP`` bytes are fetched with one read and split into arrays
+        with ``np.frombuffer``. Other datasets are read through h5py.
+        
+        Parameters
+        ----------
+        paths : Sequence[str]
+            Absolute paths to the datasets.
+        
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Dictionary mapping paths to arrays. Paths not found are left out.
+        """
+        results = {}
+        extents = []
+        for path in paths:
+            dataset = self._get_dataset(path)
+            if dataset is None:
+                continue
+            offset = self._raw_offset(dataset) if dataset.dtype.kind in 'biufcS' else None
+            if offset is None:
+                try:
+                    results[path] = self._read_array(dataset)
+                except Exception as e:
+                    self.logger.error(f"Error reading dataset {path}: {e}")
+            else:
+                extents.append((offset, offset + dataset.size * dataset.dtype.itemsize, path, dataset))
+        
+        if not extents:
+            return results
+        extents.sort(key=lambda extent: extent[0])
+        
+        runs = [[extents[0]]]
+        run_end = extents[0][1]
+        for extent in extents[1:]:
+            if extent[0] - run_end > COALESCE_GAP:
+                runs.append([])
+            runs[-1].append(extent)
+            run_end = max(run_end, extent[1])
+        
+        if len(runs) == 1:
+            self._read_run(runs[0], results)
+        else:
+            pool = self._get_read_pool()
+            for future in [pool.submit(self._read_run, run, results) for run in runs]:
+                future.result()
+        return results
+    
+    @staticmethod
+    def _get_read_pool() -> ThreadPoolExecutor:
+        """Thread pool shared by all readers for coalesced reads."""
+        global _read_pool
+        if _read_pool is None:
+            _read_pool = ThreadPoolExecutor(max_workers=READ_WORKERS,
+                                            thread_name_prefix='hdf5-read')
+        return _read_pool
+    
+    def _read_run(self, run: Sequence[Tuple[int, int, str, h5py.Dataset]],
+                  results: Dict[str, np.ndarray]):
+        """Read a run of neighbouring datasets with a single read call."""
+        start = run[0][0]
+        buffer = bytearray(max(extent[1] for extent in run) - start)
+        try:
+            with open(self.file_path, 'rb', buffering=0) as f:
+                f.seek(start)
+                complete = f.readinto(buffer) == len(buffer)
+        except OSError as e:
+            self.logger.debug(f"Coalesced read failed at offset {start}: {e}")
+            complete = False
+        
+        for offset, end, path, dataset in run:
+            try:
+                if complete:
+                    native = dataset.dtype.newbyteorder('=')
+                    dtype = native if dataset.dtype.isnative else dataset.dtype
+                    data = np.frombuffer(buffer, dtype=dtype, count=dataset.size,
+                                         offset=offset - start).reshape(dataset.shape)
+                    if dtype is not native:
+                        data = data.astype(native)
+                else:
+                    data = dataset[...]
+                results[path] = data
+            except Exception as e:
+                self.logger.error(f"Error reading dataset {path}: {e}")
+    
+    def _read_array(self, dataset: h5py.Dataset) -> np.ndarray:
+        """Read a whole dataset into a native-byte-order array.
+        
+        Large contiguous datasets are memory-mapped and chunked ones are read
+        chunk by chunk. Anything else, including scalars, is read with the
+        low-level ``DatasetID.read`` into a preallocated array, which skips
+        h5py's selection handling and lets HDF5 convert straight into the
+        destination buffer. Empty datasets and compound, variable-length or
+        other special types are read with ``dataset[...]``.
+        
+        Parameters
+        ----------
+        dataset : h5py.Dataset
+            Dataset to read.
+        
+        Returns
+        -------
+        np.ndarray
+            Dataset as numpy array.
+        """
+        if dataset.shape == () and dataset.dtype.kind in 'biufcS':
+            return self._read_whole(dataset)
+        if not dataset.shape or dataset.size == 0:
+            return dataset[...]
+        mapped = self._try_mmap(dataset)
+        if mapped is not None:
+            return mapped
+        if dataset.chunks is not None:
+            return self._read_chunked(dataset)
+        if dataset.dtype.kind in 'biufcS':
+            return self._read_whole(dataset)
+        return dataset[...]
+    
+    @staticmethod
+    def _read_whole(dataset: h5py.Dataset) -> np.ndarray:
+        """Read a whole plain-typed dataset through the low-level API."""
+        out = np.empty(dataset.shape, dtype=dataset.dtype.newbyteorder('='))
+        dataset.id.read(h5py.h5s.ALL, h5py.h5s.ALL, out)
+        return out
+    
+    def _raw_offset(self, dataset: h5py.Dataset) -> Optional[int]:
+        """File offset of a dataset stored as a single plain byte range.
+        
+        Parameters
+        ----------
+        dataset : h5py.Dataset
+            Dataset to locate.
+        
+        Returns
+        -------
+        Optional[int]
+            Byte offset of the data in the file, or None if the dataset is
+            chunked, filtered, external, empty, holds objects, its storage is
+            not allocated or the file is not backed by a plain file driver.
+        """
+        if (dataset.chunks is not None or dataset.compression is not None
+                or dataset.external or dataset.size == 0):
+            return None
+        if dataset.dtype.hasobject:
+            return None
+        if self.file is None or self.file.driver not in ('sec2', 'core'):
+            return None
+        return dataset.id.get_offset()
+    
+    def _try_mmap(self, dataset: h5py.Dataset) -> Optional[np.ndarray]:
+        """Memory-map a contiguous dataset straight from the file.
+        
+        Contiguous, unfiltered datasets are a plain byte range in the file,
+        so they can be mapped without going through the HDF5 read path. The
+        map is copy-on-write: the array is writable but the file is never
+        modified. Datasets below MMAP_MIN_BYTES are not mapped.
+        
+        Parameters
+        ----------
+        dataset : h5py.Dataset
+            Dataset to map.
+        
+        Returns
+        -------
+        Optional[np.ndarray]
+            Memory-mapped array, or None if the dataset cannot be mapped or
+            is too small to be worth it.
+        """
+        if not dataset.dtype.isnative or dataset.nbytes < MMAP_MIN_BYTES:
+            return None
+        offset = self._raw_offset(dataset)
+        if offset is None:
+            return None
+        
+        return np.memmap(self.file_path, dtype=dataset.dtype.newbyteorder('='), mode='c',
+                         offset=offset, shape=dataset.shape)
+    
+    def _read_chunked(self, dataset: h5py.Dataset) -> np.ndarray:
+        """Read a chunked dataset one chunk at a time.
+        
+        Every read selection is aligned to the dataset's chunk grid, so HDF5
+        never has to split a request into partial-chunk reads.
+        
+        Parameters
+        ----------
+        dataset : h5py.Dataset
+            Chunked dataset to read.
+        
+        Returns
+        -------
+        np.ndarray
+            Dataset as a native-byte-order numpy array.
+        """
+        out = np.empty(dataset.shape, dtype=dataset.dtype.newbyteorder('='))
+        
+        # chunk_iter (h5py >= 3.8, HDF5 >= 1.12.3) visits the chunk index
+        # once; without it iter_chunks is used, which needs no chunk index,
+        # rather than the quadratic per-chunk get_chunk_info lookup
+        chunk_infos = []
+        try:
+            dataset.id.chunk_iter(chunk_infos.append)
+        except (AttributeError, RuntimeError) as e:
+            self.logger.debug(f"chunk_iter not available for {dataset.name}: {e}")
+            chunk_infos = None
+        
+        if chunk_infos is None:
+            for chunk_slice in dataset.iter_chunks():
+                dataset.read_direct(out, source_sel=chunk_slice, dest_sel=chunk_slice)
+            return out
+        
+        # Only stored chunks are read; unwritten ones hold the fill value
+        n_chunks = int(np.prod([-(-n // c) for n, c in zip(dataset.shape, dataset.chunks)]))
+        if len(chunk_infos) < n_chunks:
+            out.fill(dataset.fillvalue)
+        
+        for info in chunk_infos:
+            if any(o >= n for o, n in zip(info.chunk_offset, dataset.shape)):
+                continue  # chunk lies beyond the current extent
+            chunk_slice = tuple(
+                slice(o, min(o + c, n))
+                for o, c, n in zip(info.chunk_offset, dataset.chunks, dataset.shape)
+            )
+            dataset.read_direct(out, source_sel=chunk_slice, dest_sel=chunk_slice)
+        return out
+    
+    def get_dataset_handle(self, path: str) -> Optional[h5py.Dataset]:
+        """Get the open ``h5py.Dataset`` at a path without reading it.
+        
+        The handle stays valid while the file is open; slice it to read only
+        part of the data.
+        
+        Parameters
+        ----------
+        path : str
+            Path to the dataset in the HDF5 file.
+        
+        Returns
+        -------
+        Optional[h5py.Dataset]
+            Dataset handle, or None if not found.
+        """
+        if not path.startswith('/'):
+            path = '/' + path
+        return self._get_dataset(path)
+    
+    def _lazy_dataset(self, path: str) -> Optional[_LazyDataset]:
+        """Get a lazy handle on a dataset without reading it.
+        
+        Parameters
+        ----------
+        path : str
+            Path to the dataset in the HDF5 file.
+        
+        Returns
+        -------
+        Optional[_LazyDataset]
+            Lazy dataset handle, or None if not found.
+        """
+        dataset = self._get_dataset(path)
+        if dataset is None:
+            return None
+        return _LazyDataset(dataset, self._read_array)
+    
+    @staticmethod
+    def _build_candidates(paths: Dict[Any, Sequence[str]]) -> Dict[str, Tuple[Any, int, int]]:
+        """Flatten per-key candidate path lists into a path-keyed table.
+        
+        Parameters
+        ----------
+        paths : Dict[Any, Sequence[str]]
+            Dictionary mapping keys to candidate paths, in order of preference.
+        
+        Returns
+        -------
+        Dict[str, Tuple[Any, int, int]]
+            Dictionary mapping each candidate path to its key, the key's
+            position and the path's rank among the key's candidates.
+        """
+        candidates = {}
+        for position, (key, key_paths) in enumerate(paths.items()):
+            for rank, path in enumerate(key_paths):
+                candidates.setdefault(path, (key, position, rank))
+        return candidates
+    
+    def _resolve_paths(self, candidates: Dict[str, Tuple[Any, int, int]]) -> Dict[Any, str]:
+        """Resolve candidate dataset paths against the dataset index.
+        
+        Whichever of the file's dataset names and the candidate table is
+        smaller is walked, with a single dict lookup into the other. When the
+        candidate table is walked, a key's remaining paths are skipped after
+        its first match, and the walk stops once every key is resolved.
+        
+        Parameters
+        ----------
+        candidates : Dict[str, Tuple[Any, int, int]]
+            Candidate table as built by ``_build_candidates``.
+        
+        Returns
+        -------
+        Dict[Any, str]
+            Dictionary mapping each key to its best-ranked candidate path
+            present in the file, in key order. Keys with no match are left out.
+        """
+        index = self._name_index
+        best = {}
+        if len(index) < len(candidates):
+            for name in index:
+                entry = candidates.get(name)
+                if entry is None:
+                    continue
+                key, position, rank = entry
+                current = best.get(key)
+                if current is None or rank < current[1]:
+                    best[key] = (position, rank, name)
+        else:
+            # The table lists each key's paths together and in order of
+            # preference, so the first match per key is its best
+            n_keys = len({entry[0] for entry in candidates.values()})
+            for path, (key, position, rank) in candidates.items():
+                if key in best or path not in index:
+                    continue
+                best[key] = (position, rank, path)
+                if len(best) == n_keys:
+                    break
+        
+        ordered = sorted(best.items(), key=lambda item: item[1][0])
+        return {key: path for key, (position, rank, path) in ordered}
+    
+    @staticmethod
+    def _materialize(value: Any) -> Any:
+        """Return the array behind a lazy handle; other values pass through."""
+        if isinstance(value, _LazyDataset):
+            return value.materialize()
+        return value
+    
+    def _materialize_many(self, keys: Sequence[str]):
+        """Read the lazy handles stored under several data keys in one batch.
+        
+        Pending handles are read together through ``_read_many``, so sibling
+        datasets lying next to each other in the file share a single read.
+        Keys that are missing or already read are skipped.
+        
+        Parameters
+        ----------
+        keys : Sequence[str]
+            Keys into ``self.data``.
+        """
+        pending = {}
+        for key in keys:
+            value = self.data.get(key)
+            if isinstance(value, _LazyDataset) and value._arr is None:
+                pending.setdefault(value.name, []).append(value)
+        if not pending:
+            return
+        
+        for path, data in self._read_many(list(pending)).items():
+            for handle in pending[path]:
+                handle._arr = data
+    
     def read_attribute(self, path: str, attr_name: str) -> Optional[Any]:
         """Read an attribute from the HDF5 file.
         
@@ -120,12 +883,8 @@ class HDF5Reader(BaseReader):
             if path in self.file:
                 obj = self.file[path]
                 if attr_name in obj.attrs:
-                    attr_value = obj.attrs[attr_name]
                     # Handle string attributes
-                    if isinstance(attr_value, bytes):
-                        attr_value = attr_value.decode('utf-8')
-                    elif isinstance(attr_value, np.ndarray) and attr_value.dtype.kind in ['S', 'U']:
-                        attr_value = str(attr_value)
+                    attr_value = _decode_attribute(obj.attrs[attr_name])
                     self.logger.debug(f"Read attribute {attr_name} from {path}: {attr_value}")
                     return attr_value
                 else:
@@ -138,93 +897,254 @@ class HDF5Reader(BaseReader):
             self.logger.error(f"Error reading attribute {attr_name} from {path}: {e}")
             return None
     
-    def read_all_datasets(self):
-        """Read all datasets from the HDF5 file."""
+    def read_all_datasets(self, lazy: bool = False):
+        """Read all datasets from the HDF5 file.
+        
+        Parameters
+        ----------
+        lazy : bool, optional
+            Store lazy handles instead of reading the arrays, by default False
+        """
         def visit_func(name, obj):
             if isinstance(obj, h5py.Dataset):
-                try:
-                    # Use the full path as the key
-                    key = name.replace('/', '_').strip('_')
-                    if not key:
-                        key = 'root_dataset'
-                    
-                    # Read the dataset
-                    data = obj[...]
-                    self.data[key] = data
-                    self.logger.debug(f"Read dataset /{name} as key '{key}' with shape {data.shape}")
-                except Exception as e:
-                    self.logger.error(f"Error reading dataset /{name}: {e}")
+                self._store_dataset(name, obj, lazy)
         
         if self.file is not None:
             self.file.visititems(visit_func)
     
     def read_metadata_to_dict(self):
-        """Read metadata (attributes) to the metadata dictionary."""
+        """Read metadata (group attributes) to the metadata dictionary.
+        
+        Only groups are visited; dataset attributes are read on demand with
+        ``read_dataset_attrs`` so the walk never opens dataset headers.
+        """
         def visit_func(name, obj):
-            # Read attributes from groups and datasets
-            for attr_name, attr_value in obj.attrs.items():
-                try:
-                    # Handle string attributes
-                    if isinstance(attr_value, bytes):
-                        attr_value = attr_value.decode('utf-8')
-                    elif isinstance(attr_value, np.ndarray) and attr_value.dtype.kind in ['S', 'U']:
-                        attr_value = str(attr_value)
-                    
-                    # Create a hierarchical key
-                    if name:
-                        key = f"{name.replace('/', '_')}_{attr_name}".strip('_')
-                    else:
-                        key = attr_name
-                    
-                    self.metadata[key] = attr_value
-                    self.logger.debug(f"Read attribute {attr_name} from /{name} as key '{key}': {attr_value}")
-                except Exception as e:
-                    self.logger.error(f"Error reading attribute {attr_name} from /{name}: {e}")
+            if isinstance(obj, h5py.Group):
+                self._store_attributes(name, obj)
         
         if self.file is not None:
             # Read root attributes
-            visit_func('', self.file)
-            # Read attributes from all objects
+            self._store_attributes('', self.file)
+            # Read attributes from all groups
             self.file.visititems(visit_func)
     
-    def list_datasets(self) -> list:
-        """List all datasets in the HDF5 file.
+    def read_dataset_attrs(self, path: str):
+        """Read the attributes of a single dataset to the metadata dictionary.
         
-        Returns
-        -------
-        list
-            List of dataset paths.
+        Keys are built the same way as in ``read_metadata_to_dict``.
+        
+        Parameters
+        ----------
+        path : str
+            Absolute path to the dataset.
         """
-        datasets = []
+        dataset = self._get_dataset(path)
+        if dataset is not None:
+            self._store_attributes(path.lstrip('/'), dataset)
+    
+    def read_path_attributes(self, paths: Sequence[str]):
+        """Read the attributes of the root group and of the given objects.
+        
+        Only the listed objects and their parent groups are visited, instead
+        of walking the whole file as ``read_metadata_to_dict`` does. Keys are
+        built the same way.
+        
+        Parameters
+        ----------
+        paths : Sequence[str]
+            Absolute paths of the objects whose attributes to read.
+        """
+        if self.file is None:
+            return
         
+        # Objects are taken from the dataset and group indexes built on the
+        # file walk, so no per-path HDF5 lookups are made
+        index = self._name_index
+        groups = self._group_index
+        
+        self._store_attributes('', self.file)
+        seen = set()
+        for path in paths:
+            parts = path.strip('/').split('/')
+            for depth in range(1, len(parts) + 1):
+                name = '/'.join(parts[:depth])
+                if name in seen:
+                    continue
+                seen.add(name)
+                obj = groups.get('/' + name)
+                if obj is None:
+                    obj = index.get('/' + name)
+                if obj is None:
+                    break
+                self._store_attributes(name, obj)
+    
+    def read_contents(self, lazy: bool = True):
+        """Read all datasets and attributes in a single walk of the file.
+        
+        Equivalent to ``read_all_datasets`` followed by
+        ``read_metadata_to_dict``, but visits each object only once. As there,
+        only group attributes are read.
+        
+        Parameters
+        ----------
+        lazy : bool, optional
+            Store lazy handles instead of reading the arrays, by default True
+        """
         def visit_func(name, obj):
             if isinstance(obj, h5py.Dataset):
-                datasets.append(f"/{name}")
+                self._store_dataset(name, obj, lazy)
+            else:
+                self._store_attributes(name, obj)
         
         if self.file is not None:
+            self._store_attributes('', self.file)
             self.file.visititems(visit_func)
+    
+    def _store_dataset(self, name: str, obj: h5py.Dataset, lazy: bool):
+        """Store a dataset in the data dictionary under its flattened path."""
+        try:
+            # Use the full path as the key
+            key = name.translate(_SLASH_TABLE).strip('_')
+            if not key:
+                key = 'root_dataset'
+            
+            # Read the dataset, or defer the read
+            data = _LazyDataset(obj, self._read_array) if lazy else self._read_array(obj)
+            self._set_data(key, data)
+            self._data_paths[key] = f"/{name}"
+            self.logger.debug("Read dataset /%s as key '%s' with shape %s", name, key, data.shape)
+        except Exception as e:
+            self.logger.error(f"Error reading dataset /{name}: {e}")
+    
+    def _store_attributes(self, name: str, obj):
+        """Store the attributes of a group or dataset in the metadata dictionary."""
+        # The flattened object path is shared by all of its attribute keys
+        prefix = name.translate(_SLASH_TABLE).lstrip('_')
         
-        return datasets
+        # Read attributes from groups and datasets
+        for attr_name, attr_value in obj.attrs.items():
+            try:
+                # Handle string attributes
+                attr_value = _decode_attribute(attr_value)
+                
+                # Create a hierarchical key
+                if not name:
+                    key = attr_name
+                elif prefix:
+                    key = f"{prefix}_{attr_name}".rstrip('_')
+                else:
+                    key = attr_name.strip('_')
+                
+                self.metadata[key] = attr_value
+                self.logger.debug("Read attribute %s from /%s as key '%s': %s", attr_name, name, key, attr_value)
+            except Exception as e:
+                self.logger.error(f"Error reading attribute {attr_name} from /{name}: {e}")
     
-    def list_groups(self) -> list:
-        """List all groups in the HDF5 file.
+    def export_state(self, max_array_bytes: int = 1024 * 1024) -> Dict[str, Any]:
+        """Export the result of ``read()`` as a picklable dictionary.
+        
+        Data backed by a dataset in the file is exported as its path; only
+        arrays without a known path or smaller than ``max_array_bytes`` are
+        included by value. Used to send import results across processes.
+        
+        Parameters
+        ----------
+        max_array_bytes : int, optional
+            Size limit for arrays exported by value, by default 1 MiB
         
         Returns
         -------
-        list
-            List of group paths.
+        Dict[str, Any]
+            Dictionary with 'metadata', 'data_paths', 'arrays', 'shapes' and
+            'dtypes' entries.
         """
-        groups = []
+        data_paths = {}
+        arrays = {}
+        for key, value in self.data.items():
+            if isinstance(value, _LazyDataset):
+                data_paths[key] = value.name
+            elif key in self._data_paths and getattr(value, 'nbytes', 0) > max_array_bytes:
+                data_paths[key] = self._data_paths[key]
+            else:
+                arrays[key] = value
         
-        def visit_func(name, obj):
-            if isinstance(obj, h5py.Group):
-                groups.append(f"/{name}")
+        return {
+            'metadata': dict(self.metadata),
+            'data_paths': data_paths,
+            'arrays': arrays,
+            'shapes': {key: spec.shape for key, spec in self.data_specs.items()},
+            'dtypes': {key: spec.dtype for key, spec in self.data_specs.items()},
+        }
+    
+    def restore_state(self, state: Dict[str, Any]):
+        """Restore the result of ``read()`` from ``export_state`` output.
+        
+        Datasets exported by path are reopened as lazy handles with direct
+        lookups, so the file is not walked again.
+        
+        Parameters
+        ----------
+        state : Dict[str, Any]
+            State dictionary returned by ``export_state``.
+        """
+        if not self.is_open:
+            self.open()
+        
+        self.metadata = dict(state['metadata'])
+        self.data = {}
+        self.data_specs = {}
+        for key in state['shapes']:
+            if key in state['arrays']:
+                self._set_data(key, state['arrays'][key])
+            else:
+                path = state['data_paths'][key]
+                self._set_data(key, _LazyDataset(self.file[path], self._read_array))
+                self._data_paths[key] = path
+    
+    def _list_objects(self) -> Dict[int, list]:
+        """Enumerate object paths in one low-level walk of the file.
+        
+        ``h5o.visit`` hands the callback the raw object info, so objects are
+        classified by type without creating a Python wrapper for each one.
+        
+        Returns
+        -------
+        Dict[int, list]
+            Dictionary mapping ``h5o`` object types to lists of absolute paths.
+        """
+        objects = {h5py.h5o.TYPE_GROUP: [], h5py.h5o.TYPE_DATASET: []}
+        
+        def visit_func(name, info):
+            paths = objects.get(info.type)
+            if paths is not None:
+                paths.append('/' + name.decode('utf-8', errors='surrogateescape'))
         
         if self.file is not None:
-            groups.append("/")  # Root group
-            self.file.visititems(visit_func)
+            h5py.h5o.visit(self.file.id, visit_func, info=True)
         
-        return groups
+        return objects
+    
+    def list_datasets(self) -> list:
+        """List all datasets in the HDF5 file.
+        
+        Returns
+        -------
+        list
+            List of dataset paths.
+        """
+        return self._list_objects()[h5py.h5o.TYPE_DATASET]
+    
+    def list_groups(self) -> list:
+        """List all groups in the HDF5 file.
+        
+        Returns
+        -------
+        list
+            List of group paths.
+        """
+        if self.file is None:
+            return []
+        return ["/"] + self._list_objects()[h5py.h5o.TYPE_GROUP]
     
     def get_file_structure(self) -> Dict[str, Any]:
         """Get the structure of the HDF5 file.
@@ -234,21 +1154,133 @@ class HDF5Reader(BaseReader):
         Dict[str, Any]
             Dictionary representing the file structure.
         """
+        objects = self._list_objects()
         structure = {
-            'groups': self.list_groups(),
-            'datasets': self.list_datasets(),
+            'groups': ["/"] + objects[h5py.h5o.TYPE_GROUP] if self.file is not None else [],
+            'datasets': objects[h5py.h5o.TYPE_DATASET],
         }
         
         return structure
     
+    @staticmethod
+    def open_h5(file_path: str) -> h5py.File:
+        """Open an HDF5 file read-only with the reader's default settings.
+        
+        The handle can be passed to ``probe_file`` and then to a reader's
+        constructor, so detecting the format and reading share one open.
+        
+        Parameters
+        ----------
+        file_path : str
+            Path to the HDF5 file.
+        
+        Returns
+        -------
+        h5py.File
+            Open file handle.
+        """
+        return h5py.File(file_path, 'r', libver='latest', **FILE_KWARGS, rdcc_nbytes=RDCC_NBYTES,
+                         rdcc_nslots=RDCC_NSLOTS, rdcc_w0=RDCC_W0)
+    
+    @staticmethod
+    def has_hdf5_signature(file_path: str) -> bool:
+        """Check for the HDF5 format signature without opening the file in h5py.
+        
+        Parameters
+        ----------
+        file_path : str
+            Path to the file to check.
+        
+        Returns
+        -------
+        bool
+            True if an HDF5 superblock signature is found, False otherwise.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                offset = 0
+                while offset + len(HDF5_SIGNATURE) <= size:
+                    f.seek(offset)
+                    if f.read(len(HDF5_SIGNATURE)) == HDF5_SIGNATURE:
+                        return True
+                    offset = offset * 2 if offset else 512
+        except OSError:
+            pass
+        return False
+    
+    @staticmethod
+    @contextmanager
+    def probe_file(file_path: str, h5_file: Optional[h5py.File] = None) -> Iterator[Optional[Tuple[Container[str], Dict[str, Any]]]]:
+        """Open an HDF5 file for format detection.
+        
+        The file is opened once; the result can be shared by several readers'
+        ``can_read_from_index`` checks while the context is active.
+        
+        Parameters
+        ----------
+        file_path : str
+            Path to the HDF5 file.
+        h5_file : h5py.File, optional
+            Already open handle on the file, used instead of opening it again.
+        
+        Yields
+        ------
+        Optional[Tuple[Container[str], Dict[str, Any]]]
+            Membership test for absolute object paths and dictionary of root
+            attributes, or None if the file is not a readable HDF5 file.
+        """
+        if h5_file is None:
+            if not HDF5Reader.has_hdf5_signature(file_path):
+                yield None
+                return
+            try:
+                f = h5py.File(file_path, 'r', libver='latest', **FILE_KWARGS)
+            except Exception:
+                yield None
+                return
+        else:
+            f = h5_file
+        
+        try:
+            try:
+                attrs = dict(f.attrs)
+            except Exception:
+                attrs = {}
+            yield _PathProbe(f), attrs
+        finally:
+            if h5_file is None:
+                f.close()
+    
     @classmethod
-    def can_read(cls, file_path: str) -> bool:
+    def can_read_from_index(cls, names: Container[str], attrs: Dict[str, Any]) -> bool:
+        """Check if a probed file can be read by this reader.
+        
+        Parameters
+        ----------
+        names : Container[str]
+            Membership test for absolute object paths, as yielded by
+            ``probe_file``.
+        attrs : Dict[str, Any]
+            Root attributes of the file, as yielded by ``probe_file``.
+        
+        Returns
+        -------
+        bool
+            True if the file can be read by this reader, False otherwise.
+        """
+        return True
+    
+    @classmethod
+    def can_read(cls, file_path: str, h5_file: Optional[h5py.File] = None) -> bool:
         """Check if the file can be read by this reader.
         
         Parameters
         ----------
         file_path : str
             Path to the file to check.
+        h5_file : h5py.File, optional
+            Already open handle on the file, used instead of opening it again.
         
         Returns
         -------
@@ -257,12 +1289,17 @@ class HDF5Reader(BaseReader):
         """
         try:
             # Check file extension
-            if not file_path.lower().endswith(('.h5', '.hdf5', '.nxs', '.nx')):
+            if not file_path.lower().endswith(HDF5_EXTENSIONS):
                 return False
             
-            # Try to open the file
-            with h5py.File(file_path, 'r') as f:
-                return True
+            # Readers without a structural check of their own accept any HDF5
+            # file, so the signature alone decides and h5py is never involved
+            if h5_file is None and cls.can_read_from_index.__func__ is HDF5Reader.can_read_from_index.__func__:
+                return cls.has_hdf5_signature(file_path)
+            
+            with cls.probe_file(file_path, h5_file) as probe:
+                if probe is None:
+                    return False
+                return cls.can_read_from_index(*probe)
         except Exception:
             return False
-
@@ -7,8 +7,9 @@ Mask I/O functionality for SAXS and XPCS data.
 
 import os
 import logging
+import threading
 import numpy as np
-from typing import Optional, Union
+from typing import NamedTuple, Optional, Union
 import h5py
 from skimage import io as skimage_io
 
@@ -16,17 +17,104 @@ from ..utils.logging_config import LoggerMixin
 
 logger = logging.getLogger(__name__)
 
+# .npy masks are memory-mapped only where a mapped file can be replaced when
+# the mask is saved back to it; Windows refuses to replace a mapped file
+MMAP_NPY_MASKS = os.name != 'nt'
+
+class RectMask(NamedTuple):
+    """Rectangular mask described by its shape and corners.
+    
+    The rectangle covers rows ``y1:y2`` and columns ``x1:x2``. Combining it
+    with another mask only touches that window, so no full-size rectangle
+    array is needed until ``materialize`` is called.
+    """
+    
+    shape: tuple
+    y1: int
+    x1: int
+    y2: int
+    x2: int
+    
+    @property
+    def window(self) -> tuple:
+        """Slices selecting the rectangle."""
+        return slice(self.y1, self.y2), slice(self.x1, self.x2)
+    
+    def materialize(self, dtype: type = bool) -> np.ndarray:
+        """Build the mask as an array.
+        
+        Parameters
+        ----------
+        dtype : type, optional
+            Data type of the returned array, by default bool
+        
+        Returns
+        -------
+        np.ndarray
+            Array that is 1 inside the rectangle and 0 elsewhere.
+        """
+        mask = np.zeros(self.shape, dtype=dtype)
+        mask[self.window] = 1
+        return mask
+    
+    def combine(self, mask: np.ndarray) -> np.ndarray:
+        """Logical AND of this rectangle with another mask.
+        
+        Parameters
+        ----------
+        mask : np.ndarray
+            Mask of the same shape.
+        
+        Returns
+        -------
+        np.ndarray
+            Boolean mask, True where ``mask`` is set inside the rectangle.
+        """
+        result = np.zeros(self.shape, dtype=bool)
+        window = self.window
+        np.not_equal(mask[window], 0, out=result[window])
+        return result
+
+class MaskDelta(NamedTuple):
+    """Change to some pixels of a mask.
+    
+    Sending the changed pixels instead of the whole mask keeps the cost of
+    an edit independent of the detector size.
+    """
+    
+    indices: tuple
+    values: Union[np.ndarray, bool, int]
+    
+    def apply(self, mask: np.ndarray) -> np.ndarray:
+        """Write the change into a mask in place.
+        
+        Parameters
+        ----------
+        mask : np.ndarray
+            Mask to change; ``indices`` must be valid for it.
+        
+        Returns
+        -------
+        np.ndarray
+            The same mask.
+        """
+        mask[self.indices] = self.values
+        return mask
+
 class MaskIO(LoggerMixin):
     """Class for loading and saving masks."""
     
     @staticmethod
-    def load_mask(file_path: str) -> Optional[np.ndarray]:
+    def load_mask(file_path: str, dtype: type = bool) -> Optional[np.ndarray]:
         """Load a mask from file.
         
         Parameters
         ----------
         file_path : str
             Path to the mask file.
+        dtype : type, optional
+            ``bool`` or ``np.uint8``, by default bool. A uint8 mask is a
+            0/1 view of the boolean mask, so neither choice copies it.
         
         Returns
         -------
@@ -42,17 +130,21 @@ class MaskIO(LoggerMixin):
             file_ext = os.path.splitext(file_path)[1].lower()
             
             if file_ext in ['.h5', '.hdf5']:
-                return MaskIO._load_mask_hdf5(file_path)
+                mask = MaskIO._load_mask_hdf5(file_path)
             elif file_ext in ['.npy']:
-                return MaskIO._load_mask_npy(file_path)
+                mask = MaskIO._load_mask_npy(file_path)
             elif file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.tif']:
-                return MaskIO._load_mask_image(file_path)
+                mask = MaskIO._load_mask_image(file_path)
             elif file_ext in ['.txt', '.dat']:
-                return MaskIO._load_mask_text(file_path)
+                mask = MaskIO._load_mask_text(file_path)
             else:
                 logger.error(f"Unsupported mask file format: {file_ext}")
                 return None
-                
+            
+            if mask is not None and np.dtype(dtype) == np.uint8:
+                mask = mask.view(np.uint8)
+            return mask
+        
         except Exception as e:
             logger.error(f"Error loading mask from {file_path}: {e}")
             return None
@@ -92,21 +184,85 @@ class MaskIO(LoggerMixin):
             
             # Save according to format
             if format == 'hdf5':
-                return MaskIO._save_mask_hdf5(mask, file_path)
+                saver = MaskIO._save_mask_hdf5
             elif format == 'npy':
-                return MaskIO._save_mask_npy(mask, file_path)
+                saver = MaskIO._save_mask_npy
+                if not file_path.endswith('.npy'):
+                    file_path += '.npy'  # as np.save does
             elif format == 'png':
-                return MaskIO._save_mask_image(mask, file_path)
+                saver = MaskIO._save_mask_image
             elif format == 'txt':
-                return MaskIO._save_mask_text(mask, file_path)
+                saver = MaskIO._save_mask_text
             else:
                 logger.error(f"Unsupported mask save format: {format}")
                 return False
-                
+            
+            return MaskIO._save_replacing(saver, mask, file_path)
+        
         except Exception as e:
             logger.error(f"Error saving mask to {file_path}: {e}")
             return False
     
+    @staticmethod
+    def _save_replacing(saver, mask: np.ndarray, file_path: str) -> bool:
+        """Save a mask to a temporary file and move it over the target.
+        
+        A loaded mask may be a memory map of the very file it is saved to;
+        writing the file in place would truncate the data under the map. On
+        POSIX systems the replaced file stays alive for as long as it is
+        mapped; on Windows, where a mapped file cannot be replaced, masks are
+        never mapped (see MMAP_NPY_MASKS).
+        
+        Parameters
+        ----------
+        saver : callable
+            Format-specific save function taking the mask and a path.
+        mask : np.ndarray
+            Mask array to save.
+        file_path : str
+            Path to save the mask file.
+        
+        Returns
+        -------
+        bool
+            True if saving was successful, False otherwise.
+        """
+        directory, name = os.path.split(os.path.abspath(file_path))
+        # The extension is kept last, as the savers pick the encoding from it
+        base, ext = os.path.splitext(name)
+        tmp_path = os.path.join(
+            directory, f".{base}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+        )
+        try:
+            if not saver(mask, tmp_path):
+                return False
+            os.replace(tmp_path, file_path)
+            return True
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def to_bool(mask: np.ndarray) -> np.ndarray:
+        """Convert a mask to bool, as a view where possible.
+        
+        Parameters
+        ----------
+        mask : np.ndarray
+            Mask array of any numeric dtype.
+        
+        Returns
+        -------
+        np.ndarray
+            The mask itself if already boolean, a view of a uint8 mask holding
+            only 0 and 1 (valid boolean bytes), or a converted copy otherwise.
+        """
+        if mask.dtype == np.bool_:
+            return mask
+        if mask.dtype == np.uint8 and mask.max(initial=0) <= 1:
+            return mask.view(bool)
+        return mask.astype(bool)
+    
     @staticmethod
     def _load_mask_hdf5(file_path: str) -> Optional[np.ndarray]:
         """Load mask from HDF5 file."""
@@ -115,22 +271,23 @@ class MaskIO(LoggerMixin):
                 # Look for common mask dataset names
                 mask_names = ['mask', 'data', 'array']
                 for name in mask_names:
-                    if name in f:
-                        mask = f[name][...]
+                    obj = f.get(name)
+                    if isinstance(obj, h5py.Dataset):
+                        mask = obj[...]
                         logger.debug(f"Loaded mask from HDF5 dataset '{name}' with shape {mask.shape}")
-                        return mask.astype(bool)
+                        return MaskIO.to_bool(mask)
                 
-                # If no common names found, use the first dataset
-                datasets = []
-                f.visit(lambda name: datasets.append(name) if isinstance(f[name], h5py.Dataset) else None)
-                if datasets:
-                    mask = f[datasets[0]][...]
-                    logger.debug(f"Loaded mask from HDF5 dataset '{datasets[0]}' with shape {mask.shape}")
-                    return mask.astype(bool)
+                # If no common names found, use the first dataset; the walk
+                # hands over each object and stops at the first match
+                first = f.visititems(lambda name, obj: name if isinstance(obj, h5py.Dataset) else None)
+                if first is not None:
+                    mask = f[first][...]
+                    logger.debug(f"Loaded mask from HDF5 dataset '{first}' with shape {mask.shape}")
+                    return MaskIO.to_bool(mask)
                 
                 logger.error("No datasets found in HDF5 mask file")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Error loading HDF5 mask: {e}")
             return None
@@ -139,8 +296,17 @@ class MaskIO(LoggerMixin):
     def _save_mask_hdf5(mask: np.ndarray, file_path: str) -> bool:
         """Save mask to HDF5 file."""
         try:
+            data = mask.view(np.uint8) if mask.dtype == np.bool_ else mask.astype(np.uint8)
+            
+            # Masks are long runs of 0 and 1, so LZF (built into h5py, no
+            # plugin needed to read it back) shrinks them many times over
+            options = {}
+            if data.ndim == 2 and data.size:
+                options = {'chunks': (min(1024, data.shape[0]), min(1024, data.shape[1])),
+                           'compression': 'lzf'}
+            
             with h5py.File(file_path, 'w') as f:
-                f.create_dataset('mask', data=mask.astype(np.uint8))
+                f.create_dataset('mask', data=data, **options)
                 f.attrs['description'] = 'SAXS/XPCS mask file'
                 f.attrs['format'] = 'boolean mask (0=masked, 1=valid)'
             logger.debug(f"Saved mask to HDF5 file with shape {mask.shape}")
@@ -153,9 +319,12 @@ class MaskIO(LoggerMixin):
     def _load_mask_npy(file_path: str) -> Optional[np.ndarray]:
         """Load mask from NumPy file."""
         try:
-            mask = np.load(file_path)
+            # Map the file copy-on-write: pages are read on access and the
+            # mask stays writable without ever modifying the file
+            mmap_mode = 'c' if MMAP_NPY_MASKS else None
+            mask = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
             logger.debug(f"Loaded mask from NumPy file with shape {mask.shape}")
-            return mask.astype(bool)
+            return MaskIO.to_bool(mask)
         except Exception as e:
             logger.error(f"Error loading NumPy mask: {e}")
             return None
@@ -164,7 +333,8 @@ class MaskIO(LoggerMixin):
     def _save_mask_npy(mask: np.ndarray, file_path: str) -> bool:
         """Save mask to NumPy file."""
         try:
-            np.save(file_path, mask.astype(np.uint8))
+            data = mask.view(np.uint8) if mask.dtype == np.bool_ else mask.astype(np.uint8)
+            np.save(file_path, data)
             logger.debug(f"Saved mask to NumPy file with shape {mask.shape}")
             return True
         except Exception as e:
@@ -175,24 +345,56 @@ class MaskIO(LoggerMixin):
     def _load_mask_image(file_path: str) -> Optional[np.ndarray]:
         """Load mask from image file."""
         try:
+            # Single-channel images (bilevel or 8-bit gray, as written by
+            # _save_mask_image) need no RGB handling; decode them directly
+            mask = MaskIO._read_single_channel_image(file_path)
+            if mask is not None:
+                mask = mask if mask.dtype == np.bool_ else mask > 0
+                logger.debug(f"Loaded mask from image file with shape {mask.shape}")
+                return mask
+            
             mask = skimage_io.imread(file_path)
             # Convert to boolean (assuming non-zero values are valid pixels)
-            if mask.ndim == 3:
-                # Convert RGB to grayscale
-                mask = np.mean(mask, axis=2)
-            mask = mask > 0
+            if mask.ndim == 3 and mask.dtype.kind in 'ub':
+                # For unsigned pixels a positive channel mean means any
+                # channel is set, which needs no float64 grayscale image
+                mask = mask.any(axis=2)
+            else:
+                if mask.ndim == 3:
+                    # Convert RGB to grayscale
+                    mask = np.mean(mask, axis=2)
+                mask = mask > 0
             logger.debug(f"Loaded mask from image file with shape {mask.shape}")
             return mask
         except Exception as e:
             logger.error(f"Error loading image mask: {e}")
             return None
     
+    @staticmethod
+    def _read_single_channel_image(file_path: str) -> Optional[np.ndarray]:
+        """Decode a single-frame bilevel or 8-bit grayscale image with Pillow.
+        
+        Returns None for any other image, or if Pillow cannot open the file,
+        so the caller can fall back to scikit-image.
+        """
+        try:
+            from PIL import Image
+            with Image.open(file_path) as image:
+                if image.mode not in ('1', 'L') or getattr(image, 'n_frames', 1) != 1:
+                    return None
+                # Decoded into a new, writable array; np.asarray would give
+                # a read-only view for bilevel images
+                return np.array(image)
+        except Exception:
+            return None
+    
     @staticmethod
     def _save_mask_image(mask: np.ndarray, file_path: str) -> bool:
         """Save mask to image file."""
         try:
-            # Convert boolean mask to 0-255 range
-            mask_image = (mask.astype(np.uint8) * 255)
+            # Convert boolean mask to 0-255 range in a single output array
+            data = mask.view(np.uint8) if mask.dtype == np.bool_ else mask.astype(np.uint8)
+            mask_image = np.multiply(data, np.uint8(255), dtype=np.uint8)
             skimage_io.imsave(file_path, mask_image)
             logger.debug(f"Saved mask to image file with shape {mask.shape}")
             return True
@@ -204,9 +406,16 @@ class MaskIO(LoggerMixin):
     def _load_mask_text(file_path: str) -> Optional[np.ndarray]:
         """Load mask from text file."""
         try:
-            mask = np.loadtxt(file_path)
+            try:
+                # pandas' C tokenizer is far faster than np.loadtxt on large
+                # masks; squeeze like np.loadtxt for single rows or columns
+                import pandas as pd
+                mask = pd.read_csv(file_path, sep=r'\s+', header=None, comment='#',
+                                   engine='c').to_numpy().squeeze()
+            except ImportError:
+                mask = np.loadtxt(file_path)
             logger.debug(f"Loaded mask from text file with shape {mask.shape}")
-            return mask.astype(bool)
+            return MaskIO.to_bool(mask)
         except Exception as e:
             logger.error(f"Error loading text mask: {e}")
             return None
@@ -215,13 +424,35 @@ class MaskIO(LoggerMixin):
     def _save_mask_text(mask: np.ndarray, file_path: str) -> bool:
         """Save mask to text file."""
         try:
-            np.savetxt(file_path, mask.astype(np.uint8), fmt='%d')
+            data = mask.view(np.uint8) if mask.dtype == np.bool_ else mask.astype(np.uint8)
+            if data.ndim == 2 and data.size and data.max() <= 9:
+                MaskIO._write_digit_rows(data, file_path)
+            else:
+                np.savetxt(file_path, data, fmt='%d')
             logger.debug(f"Saved mask to text file with shape {mask.shape}")
             return True
         except Exception as e:
             logger.error(f"Error saving text mask: {e}")
             return False
     
+    @staticmethod
+    def _write_digit_rows(data: np.ndarray, file_path: str, block_rows: int = 1024):
+        """Write a 2-D array of single digits as space-separated text rows.
+        
+        Produces the same bytes as ``np.savetxt(..., fmt='%d')``, but builds
+        the text with array operations, a block of rows at a time, instead of
+        formatting every value in Python.
+        """
+        height, width = data.shape
+        with open(file_path, 'wb', buffering=1 << 18) as f:
+            for start in range(0, height, block_rows):
+                block = data[start:start + block_rows]
+                text = np.empty((block.shape[0], 2 * width), dtype=np.uint8)
+                text[:, 0::2] = block + ord('0')
+                text[:, 1::2] = ord(' ')
+                text[:, -1] = ord('\n')
+                f.write(text.tobytes())
+    
     @staticmethod
     def create_circular_mask(shape: tuple, center: tuple, radius: float) -> np.ndarray:
         """Create a circular mask.
@@ -240,8 +471,11 @@ class MaskIO(LoggerMixin):
         np.ndarray
             Boolean mask array.
         """
-        y, x = np.ogrid[:shape[0], :shape[1]]
-        mask = (x - center[1])**2 + (y - center[0])**2 <= radius**2
+        # Compare the squared row distances against the per-column remainder
+        # of radius**2, so the only full-size array is the boolean result
+        dy2 = (np.arange(shape[0]) - center[0])**2
+        dx2 = (np.arange(shape[1]) - center[1])**2
+        mask = dy2[:, None] <= radius**2 - dx2[None, :]
         return mask
     
     @staticmethod
@@ -262,9 +496,27 @@ class MaskIO(LoggerMixin):
         np.ndarray
             Boolean mask array.
         """
-        mask = np.zeros(shape, dtype=bool)
+        return MaskIO.rect_mask(shape, top_left, bottom_right).materialize()
+    
+    @staticmethod
+    def rect_mask(shape: tuple, top_left: tuple, bottom_right: tuple) -> RectMask:
+        """Describe a rectangular mask without allocating it.
+        
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the mask (height, width).
+        top_left : tuple
+            Top-left corner (y, x).
+        bottom_right : tuple
+            Bottom-right corner (y, x).
+        
+        Returns
+        -------
+        RectMask
+            Rectangle that can be combined with other masks or materialized.
+        """
         y1, x1 = top_left
         y2, x2 = bottom_right
-        mask[y1:y2, x1:x2] = True
-        return mask
+        return RectMask(tuple(shape), y1, x1, y2, x2)
 
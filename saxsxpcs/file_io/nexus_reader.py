@@ -7,22 +7,78 @@ NeXus file reader for the SAXS-XPCS Analysis Suite.
 
 import logging
 import numpy as np
-from .hdf5_reader import HDF5Reader
+import h5py
+from .hdf5_reader import HDF5Reader, RDCC_NBYTES
 
 logger = logging.getLogger(__name__)
 
+# Chunk cache hash slots for NeXus files: a prime well above the number of
+# chunks a frame-chunked detector stack keeps in a 256 MiB cache
+NEXUS_RDCC_NSLOTS = 100003
+
 class NeXusReader(HDF5Reader):
     """Reader for NeXus format files."""
     
-    def __init__(self, file_path):
+    # Common NeXus paths for SAXS data, in order of preference
+    SAXS_PATHS = [
+        '/entry/data/data',
+        '/entry/instrument/detector/data',
+        '/entry_0000/instrument/detector/data',
+        '/entry_0000/ESRF-ID02/eiger500k/data',
+        '/entry/ESRF-ID02/eiger500k/data',
+        '/data/data',
+        '/detector/data'
+    ]
+    
+    # Common NeXus paths for XPCS data, in order of preference
+    XPCS_PATHS = {
+        'g2': [
+            '/entry/analysis/g2',
+            '/entry_0000/analysis/g2',
+            '/analysis/g2',
+            '/g2'
+        ],
+        'tau': [
+            '/entry/analysis/tau',
+            '/entry_0000/analysis/tau',
+            '/analysis/tau',
+            '/tau'
+        ],
+        'intensity': [
+            '/entry/analysis/intensity',
+            '/entry_0000/analysis/intensity',
+            '/analysis/intensity',
+            '/intensity'
+        ],
+        'twotime': [
+            '/entry/analysis/twotime',
+            '/entry_0000/analysis/twotime',
+            '/analysis/twotime',
+            '/twotime'
+        ]
+    }
+    
+    # Path-keyed candidate table resolved against the dataset index
+    _XPCS_CANDIDATES = HDF5Reader._build_candidates(XPCS_PATHS)
+    
+    def __init__(self, file_path, rdcc_nbytes=RDCC_NBYTES, rdcc_nslots=NEXUS_RDCC_NSLOTS, **kwargs):
         """Initialize the NeXus reader.
         
         Parameters
         ----------
         file_path : str
             Path to the NeXus file.
+        rdcc_nbytes : int, optional
+            Raw data chunk cache size in bytes, by default 256 MiB. It must
+            hold at least one full chunk: detector stacks are typically
+            chunked per frame, and a chunk larger than the cache is re-read
+            from disk on every slice.
+        rdcc_nslots : int, optional
+            Number of chunk cache hash slots, by default NEXUS_RDCC_NSLOTS
+        **kwargs
+            Other settings passed on to ``HDF5Reader``.
         """
-        super().__init__(file_path)
+        super().__init__(file_path, rdcc_nbytes=rdcc_nbytes, rdcc_nslots=rdcc_nslots, **kwargs)
         self.logger.debug(f"NeXus reader initialized for {file_path}")
     
     def get_metadata(self):
@@ -55,7 +111,7 @@ class NeXusReader(HDF5Reader):
                         sample = entry['sample']
                         if 'name' in sample:
                             metadata['sample_name'] = self.safe_read_dataset(sample['name'])
-                
+        
         except Exception as e:
             self.logger.warning(f"Could not read NeXus metadata: {e}")
         
@@ -70,25 +126,18 @@ class NeXusReader(HDF5Reader):
             SAXS data array, or None if not found.
         """
         try:
-            with self.open_file() as f:
-                # Try common NeXus paths for SAXS data
-                saxs_paths = [
-                    'entry/data/data',
-                    'entry/instrument/detector/data',
-                    'entry_0000/instrument/detector/data',
-                    'entry_0000/ESRF-ID02/eiger500k/data',
-                    'entry/ESRF-ID02/eiger500k/data',
-                    'data/data',
-                    'detector/data'
-                ]
+            with self.open_file():
+                # Candidates are looked up in the dataset index built on
+                # first use, not probed in the file one by one
+                index = self._name_index
                 
-                for path in saxs_paths:
+                for path in self.SAXS_PATHS:
                     try:
-                        if path in f:
-                            data = f[path]
+                        if path in index:
+                            data = index[path]
                             if hasattr(data, 'shape') and len(data.shape) >= 2:
                                 # Read the data
-                                saxs_data = data[:]
+                                saxs_data = self._read_array(data)
                                 self.logger.info(f"Found SAXS data at {path} with shape {saxs_data.shape}")
                                 return saxs_data
                     except Exception as e:
@@ -100,18 +149,113 @@ class NeXusReader(HDF5Reader):
                 for key, value in data_dict.items():
                     if hasattr(value, 'shape') and len(value.shape) >= 2:
                         self.logger.info(f"Using {key} as SAXS data with shape {value.shape}")
-                        return value
+                        return self._materialize(value)
                 
                 self.logger.warning("No suitable SAXS data found in NeXus file")
                 return None
-                
+        
         except Exception as e:
             self.logger.error(f"Error reading SAXS data from NeXus file: {e}")
             return None
     
-    def get_xpcs_data(self):
+    def get_frame(self, index=0):
+        """Get a single detector frame from the NeXus file.
+        
+        Only the requested frame of an image stack is read.
+        
+        Parameters
+        ----------
+        index : int, optional
+            Frame index into an image stack, by default 0. Ignored for a
+            single 2D image.
+        
+        Returns
+        -------
+        numpy.ndarray or None
+            2D frame, or None if not found.
+        """
+        try:
+            with self.open_file():
+                datasets = self._name_index
+                for path in self.SAXS_PATHS:
+                    data = datasets.get(path)
+                    if data is not None and len(data.shape) >= 3:
+                        return data[index]
+                    if data is not None and len(data.shape) == 2:
+                        return self._read_array(data)
+        
+        except Exception as e:
+            self.logger.error(f"Error reading SAXS frame from NeXus file: {e}")
+            return None
+        
+        # Not at a common SAXS path; fall back to any 2D/3D data
+        return super().get_frame(index)
+    
+    def get_saxs_frames(self, indices):
+        """Read selected frames of the SAXS image stack.
+        
+        The frames are read with a single ``read_direct`` call into a
+        preallocated array, selecting sorted, unique frame indices in the
+        file rather than fancy-indexing the dataset through h5py.
+        
+        Parameters
+        ----------
+        indices : sequence of int
+            Frame indices in any order; negative indices count from the end.
+        
+        Returns
+        -------
+        numpy.ndarray or None
+            Array of shape (len(indices), ...) with the frames in the order
+            requested, or None if no image stack is found or reading fails.
+        """
+        try:
+            with self.open_file():
+                index = self._name_index
+                dataset = None
+                for path in self.SAXS_PATHS:
+                    data = index.get(path)
+                    if data is not None and len(data.shape) >= 3:
+                        dataset = data
+                        break
+                if dataset is None:
+                    self.logger.warning("No SAXS image stack found in NeXus file")
+                    return None
+                
+                n_frames = dataset.shape[0]
+                indices = np.asarray(indices, dtype=np.intp).ravel()
+                if indices.size and (indices.min() < -n_frames or indices.max() >= n_frames):
+                    raise IndexError(f"Frame index out of range for {n_frames} frames")
+                indices = indices % max(n_frames, 1)
+                
+                # read_direct needs increasing, unique source indices; a
+                # contiguous run is selected as a single hyperslab
+                unique, inverse = np.unique(indices, return_inverse=True)
+                frames = np.empty((len(unique),) + dataset.shape[1:], dtype=dataset.dtype)
+                if len(unique):
+                    if unique[-1] - unique[0] + 1 == len(unique):
+                        source = np.s_[int(unique[0]):int(unique[-1]) + 1]
+                    else:
+                        source = np.s_[unique.tolist()]
+                    dataset.read_direct(frames, source_sel=source, dest_sel=np.s_[:])
+                
+                if not np.array_equal(unique, indices):
+                    frames = frames[inverse]
+                return frames
+        
+        except Exception as e:
+            self.logger.error(f"Error reading SAXS frames from NeXus file: {e}")
+            return None
+    
+    def get_xpcs_data(self, keys=None):
         """Get XPCS data from the NeXus file.
         
+        Parameters
+        ----------
+        keys : sequence of str, optional
+            XPCS keys to read, e.g. ('g2', 'tau'), by default all keys of
+            XPCS_PATHS
+        
         Returns
         -------
         dict
@@ -120,47 +264,19 @@ class NeXusReader(HDF5Reader):
         xpcs_data = {}
         
         try:
-            with self.open_file() as f:
-                # Try common NeXus paths for XPCS data
-                xpcs_paths = {
-                    'g2': [
-                        'entry/analysis/g2',
-                        'entry_0000/analysis/g2',
-                        'analysis/g2',
-                        'g2'
-                    ],
-                    'tau': [
-                        'entry/analysis/tau',
-                        'entry_0000/analysis/tau',
-                        'analysis/tau',
-                        'tau'
-                    ],
-                    'intensity': [
-                        'entry/analysis/intensity',
-                        'entry_0000/analysis/intensity',
-                        'analysis/intensity',
-                        'intensity'
-                    ],
-                    'twotime': [
-                        'entry/analysis/twotime',
-                        'entry_0000/analysis/twotime',
-                        'analysis/twotime',
-                        'twotime'
-                    ]
-                }
-                
-                for data_type, paths in xpcs_paths.items():
-                    for path in paths:
-                        try:
-                            if path in f:
-                                data = f[path]
-                                xpcs_data[data_type] = data[:]
-                                self.logger.debug(f"Found {data_type} data at {path}")
-                                break
-                        except Exception as e:
-                            self.logger.debug(f"Could not read {data_type} from {path}: {e}")
-                            continue
+            with self.open_file():
+                paths = self._resolve_paths(self._XPCS_CANDIDATES)
+                if keys is not None:
+                    paths = {key: path for key, path in paths.items() if key in keys}
                 
+                # The resolved datasets are read in one batch, so neighbouring
+                # ones share a single read
+                arrays = self._read_many(list(paths.values()))
+                for data_type, path in paths.items():
+                    if path in arrays:
+                        xpcs_data[data_type] = arrays[path]
+                        self.logger.debug(f"Found {data_type} data at {path}")
+        
         except Exception as e:
             self.logger.error(f"Error reading XPCS data from NeXus file: {e}")
         
@@ -175,19 +291,21 @@ class NeXusReader(HDF5Reader):
             Q-map array, or None if not found.
         """
         try:
-            with self.open_file() as f:
+            with self.open_file():
+                index = self._name_index
+                
                 # Try common NeXus paths for Q-map
                 q_paths = [
-                    'entry/analysis/q_map',
-                    'entry_0000/analysis/q_map',
-                    'analysis/q_map',
-                    'q_map'
+                    '/entry/analysis/q_map',
+                    '/entry_0000/analysis/q_map',
+                    '/analysis/q_map',
+                    '/q_map'
                 ]
                 
                 for path in q_paths:
                     try:
-                        if path in f:
-                            q_map = f[path][:]
+                        if path in index:
+                            q_map = self._read_array(index[path])
                             self.logger.debug(f"Found Q-map at {path}")
                             return q_map
                     except Exception as e:
@@ -195,7 +313,7 @@ class NeXusReader(HDF5Reader):
                         continue
                 
                 return None
-                
+        
         except Exception as e:
             self.logger.error(f"Error reading Q-map from NeXus file: {e}")
             return None
@@ -209,19 +327,21 @@ class NeXusReader(HDF5Reader):
             Mask array, or None if not found.
         """
         try:
-            with self.open_file() as f:
+            with self.open_file():
+                index = self._name_index
+                
                 # Try common NeXus paths for mask
                 mask_paths = [
-                    'entry/analysis/mask',
-                    'entry_0000/analysis/mask',
-                    'analysis/mask',
-                    'mask'
+                    '/entry/analysis/mask',
+                    '/entry_0000/analysis/mask',
+                    '/analysis/mask',
+                    '/mask'
                 ]
                 
                 for path in mask_paths:
                     try:
-                        if path in f:
-                            mask = f[path][:]
+                        if path in index:
+                            mask = self._read_array(index[path])
                             self.logger.debug(f"Found mask at {path}")
                             return mask
                     except Exception as e:
@@ -229,7 +349,7 @@ class NeXusReader(HDF5Reader):
                         continue
                 
                 return None
-                
+        
         except Exception as e:
             self.logger.error(f"Error reading mask from NeXus file: {e}")
             return None
@@ -237,21 +357,24 @@ class NeXusReader(HDF5Reader):
     def list_datasets(self):
         """List all datasets in the NeXus file.
         
+        Shape and dtype are taken from the objects handed over by the walk,
+        so callers can pick datasets without looking them up again.
+        
         Returns
         -------
         list
-            List of dataset paths.
+            List of (path, shape, dtype) tuples.
         """
         datasets = []
         
         try:
             with self.open_file() as f:
                 def visit_func(name, obj):
-                    if hasattr(obj, 'shape'):  # It's a dataset
-                        datasets.append(name)
+                    if isinstance(obj, h5py.Dataset):
+                        datasets.append((name, obj.shape, obj.dtype))
                 
                 f.visititems(visit_func)
-                
+        
         except Exception as e:
             self.logger.error(f"Error listing datasets: {e}")
         
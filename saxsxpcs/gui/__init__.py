@@ -5,10 +5,7 @@
 GUI modules for the SAXS and XPCS Analysis Suite.
 """
 
-from .main_window import MainWindow
-from .widgets import (
-    FileBrowserWidget, DataPreviewWidget, MaskEditorWidget, BeamParameterWidget
-)
+import importlib
 
 __all__ = [
     'MainWindow',
@@ -18,3 +15,27 @@ __all__ = [
     'BeamParameterWidget',
 ]
 
+# Submodule providing each public name; imported on first access, since the
+# widgets pull in PyQt5, pyqtgraph and matplotlib
+_LAZY_IMPORTS = {
+    'MainWindow': '.main_window',
+    'FileBrowserWidget': '.widgets',
+    'DataPreviewWidget': '.widgets',
+    'MaskEditorWidget': '.widgets',
+    'BeamParameterWidget': '.widgets',
+}
+
+
+def __getattr__(name):
+    """Import GUI classes on first access and cache them in the module."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List module attributes, including GUI classes not imported yet."""
+    return sorted(set(globals()) | set(__all__))
@@ -8,22 +8,29 @@ Main window for the SAXS-XPCS Analysis Suite.
 import os
 import sys
 import logging
+import numpy as np
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QAction,
     QMenu, QToolBar, QStatusBar, QFileDialog, QMessageBox, QDockWidget,
-    QApplication, QSplitter
+    QApplication, QSplitter, QProgressDialog
 )
-from PyQt5.QtCore import Qt, QSettings, QSize, pyqtSignal
+from PyQt5.QtCore import Qt, QSettings, QSize, QThreadPool, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QKeySequence
 
-from .widgets import (
-    FileBrowserWidget, DataPreviewWidget, MaskEditorWidget, BeamParameterWidget
-)
-from ..file_io import FileImporter
+from .widgets import FileBrowserWidget, DataPreviewWidget
+from .workers import ImportWorker, ScanWorker
+from ..file_io import FileImporter, MaskDelta
 from ..utils.logging_config import LoggerMixin
 
 logger = logging.getLogger(__name__)
 
+# Minimum interval in milliseconds between progress messages in the status bar
+STATUS_INTERVAL_MS = 100
+
+# Longest time in milliseconds the window waits on close for background work
+# to stop
+CLOSE_TIMEOUT_MS = 3000
+
 class MainWindow(QMainWindow, LoggerMixin):
     """Main window for the SAXS-XPCS Analysis Suite."""
     
@@ -44,6 +51,35 @@ class MainWindow(QMainWindow, LoggerMixin):
         # Initialize the file importer
         self.file_importer = FileImporter()
         
+        # Home directory, the default location of the file dialogs
+        self._home = os.path.expanduser("~")
+        
+        # Application settings, shared by load_settings and save_settings
+        self._settings = QSettings("SAXS-XPCS", "Analysis Suite")
+        
+        # Progress messages are shown at most every STATUS_INTERVAL_MS; only
+        # the latest pending one is displayed
+        self._status_pending = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(STATUS_INTERVAL_MS)
+        self._status_timer.timeout.connect(self._flush_status)
+        
+        # Running import worker and its progress dialog
+        self._import_worker = None
+        self._import_progress = None
+        
+        # File dialog shown by open_files
+        self._open_dialog = None
+        
+        # Running directory scan and the files it has found so far
+        self._scan_worker = None
+        self._scan_results = []
+        
+        # Mask from the mask editor; edits arrive as MaskDelta and are
+        # applied to it in place
+        self.current_mask = None
+        
         # Initialize the UI
         self.init_ui()
         
@@ -70,9 +106,11 @@ class MainWindow(QMainWindow, LoggerMixin):
         self.data_preview_widget = DataPreviewWidget(self.file_importer)
         self.central_widget.addTab(self.data_preview_widget, "Data Preview")
         
-        # Create the mask editor widget
-        self.mask_editor_widget = MaskEditorWidget(self.file_importer)
-        self.central_widget.addTab(self.mask_editor_widget, "Mask Editor")
+        # The mask editor is created when its tab is first shown; until then
+        # the tab holds an empty placeholder
+        self.mask_editor_widget = None
+        self._mask_editor_placeholder = QWidget()
+        self.central_widget.addTab(self._mask_editor_placeholder, "Mask Editor")
         
         # Create dock widgets
         self.create_dock_widgets()
@@ -103,17 +141,23 @@ class MainWindow(QMainWindow, LoggerMixin):
         self.file_browser_widget = FileBrowserWidget()
         self.file_browser_dock.setWidget(self.file_browser_widget)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.file_browser_dock)
+        self.file_browser_toggle_action = self.file_browser_dock.toggleViewAction()
         
         # Beam parameter dock widget
         self.beam_parameter_dock = QDockWidget("Beam Parameters", self)
+        self.beam_parameter_dock.setObjectName("BeamParameterDock")
         self.beam_parameter_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
         self.beam_parameter_dock.setFeatures(
             QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable
         )
         
-        self.beam_parameter_widget = BeamParameterWidget(self.file_importer)
-        self.beam_parameter_dock.setWidget(self.beam_parameter_widget)
+        # The widget is created when the dock is first shown, which a
+        # restored window state may never do
+        self.beam_parameter_widget = None
+        self.beam_parameter_dock.setWidget(QWidget())
+        self.beam_parameter_dock.visibilityChanged.connect(self._ensure_beam_parameter_widget)
         self.addDockWidget(Qt.RightDockWidgetArea, self.beam_parameter_dock)
+        self.beam_parameter_toggle_action = self.beam_parameter_dock.toggleViewAction()
     
     def create_menu_bar(self):
         """Create the menu bar."""
@@ -167,8 +211,7 @@ class MainWindow(QMainWindow, LoggerMixin):
         view_menu = menu_bar.addMenu("&View")
         
         # Dock widget toggles
-        view_menu.addAction(self.file_browser_dock.toggleViewAction())
-        view_menu.addAction(self.beam_parameter_dock.toggleViewAction())
+        view_menu.addActions([self.file_browser_toggle_action, self.beam_parameter_toggle_action])
         
         view_menu.addSeparator()
         
@@ -236,16 +279,32 @@ class MainWindow(QMainWindow, LoggerMixin):
         self.tool_bar = QToolBar("Main Toolbar")
         self.addToolBar(self.tool_bar)
         
-        # Add actions to toolbar
-        self.tool_bar.addAction(self.open_action)
-        self.tool_bar.addAction(self.save_action)
-        self.tool_bar.addSeparator()
-        self.tool_bar.addAction(self.mask_editor_action)
-        self.tool_bar.addAction(self.process_action)
-        self.tool_bar.addSeparator()
-        self.tool_bar.addAction(self.zoom_in_action)
-        self.tool_bar.addAction(self.zoom_out_action)
-        self.tool_bar.addAction(self.zoom_reset_action)
+        # Add actions to toolbar; None marks a separator
+        self._add_actions(self.tool_bar, [
+            self.open_action, self.save_action, None,
+            self.mask_editor_action, self.process_action, None,
+            self.zoom_in_action, self.zoom_out_action, self.zoom_reset_action,
+        ])
+    
+    @staticmethod
+    def _add_actions(widget, actions):
+        """Add actions to a menu or tool bar, one addActions call per group.
+        
+        Parameters
+        ----------
+        widget : QMenu or QToolBar
+            Widget to add the actions to.
+        actions : list
+            Actions in order, with None where a separator goes.
+        """
+        start = 0
+        for end, action in enumerate(actions + [None]):
+            if action is None:
+                if end > start:
+                    widget.addActions(actions[start:end])
+                if end < len(actions):
+                    widget.addSeparator()
+                start = end + 1
     
     def connect_signals(self):
         """Connect signals and slots."""
@@ -256,54 +315,73 @@ class MainWindow(QMainWindow, LoggerMixin):
         # Data preview signals
         self.data_preview_widget.data_changed.connect(self.on_data_changed)
         
-        # Mask editor signals
-        self.mask_editor_widget.mask_updated.connect(self.on_mask_updated)
-        
-        # Beam parameter signals
-        self.beam_parameter_widget.parameters_updated.connect(self.on_parameters_updated)
-        
         # Tab change signal
         self.central_widget.currentChanged.connect(self.on_tab_changed)
     
     def open_files(self):
         """Open files dialog."""
-        file_dialog = QFileDialog(self)
-        file_dialog.setFileMode(QFileDialog.ExistingFiles)
-        file_dialog.setNameFilter("Data Files (*.h5 *.hdf5 *.nxs *.nx);;All Files (*)")
-        file_dialog.setDirectory(os.path.expanduser("~"))
-        
-        if file_dialog.exec_():
-            file_paths = file_dialog.selectedFiles()
-            if file_paths:
-                self.import_files(file_paths)
+        # The dialog is created once and reused. Options must be set before
+        # the other properties; the Qt dialog is shown with open() so the
+        # event loop is never blocked
+        file_dialog = self._open_dialog
+        if file_dialog is None:
+            file_dialog = QFileDialog(self)
+            file_dialog.setOptions(QFileDialog.DontUseNativeDialog)
+            file_dialog.setFileMode(QFileDialog.ExistingFiles)
+            file_dialog.setNameFilter("Data Files (*.h5 *.hdf5 *.nxs *.nx);;All Files (*)")
+            file_dialog.filesSelected.connect(self.import_files)
+            self._open_dialog = file_dialog
+        
+        file_dialog.setDirectory(self._home)
+        file_dialog.open()
     
     def open_directory(self):
         """Open directory dialog."""
         directory = QFileDialog.getExistingDirectory(
-            self, "Select Directory", os.path.expanduser("~")
+            self, "Select Directory", self._home
         )
         
         if directory:
-            # Find all supported files in the directory
-            supported_extensions = ['.h5', '.hdf5', '.nxs', '.nx']
-            file_paths = []
-            
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    if any(file.lower().endswith(ext) for ext in supported_extensions):
-                        file_paths.append(os.path.join(root, file))
+            if self._scan_worker is not None:
+                self.status_bar.showMessage("A directory scan is already in progress", 5000)
+                return
             
-            if file_paths:
-                self.import_files(file_paths)
-            else:
-                QMessageBox.information(
-                    self, "No Files Found", 
-                    f"No supported data files found in {directory}"
-                )
+            # Find all supported files in the directory off the GUI thread
+            self.status_bar.showMessage(f"Scanning {directory}...")
+            self._scan_results = []
+            worker = ScanWorker(directory)
+            worker.signals.found_batch.connect(self._scan_results.extend)
+            worker.signals.finished.connect(lambda: self.on_directory_scanned(directory))
+            self._scan_worker = worker
+            QThreadPool.globalInstance().start(worker)
+    
+    def on_directory_scanned(self, directory):
+        """Import the files found by a directory scan.
+        
+        Parameters
+        ----------
+        directory : str
+            Directory that was scanned.
+        """
+        file_paths = self._scan_results
+        self._scan_worker = None
+        self._scan_results = []
+        
+        if file_paths:
+            self.import_files(file_paths)
+        else:
+            self.status_bar.clearMessage()
+            QMessageBox.information(
+                self, "No Files Found", 
+                f"No supported data files found in {directory}"
+            )
     
     def import_files(self, file_paths):
         """Import files using the file importer.
         
+        The files are read by an ImportWorker on the global thread pool;
+        on_import_finished or on_import_error handles the result.
+        
         Parameters
         ----------
         file_paths : list
@@ -312,44 +390,119 @@ class MainWindow(QMainWindow, LoggerMixin):
         if not file_paths:
             return
         
+        if self._import_worker is not None:
+            self.status_bar.showMessage("An import is already in progress", 5000)
+            return
+        
         self.status_bar.showMessage("Importing files...")
         
-        try:
-            # Import files
-            readers = self.file_importer.import_files(file_paths)
+        # Files are read on a pool thread so the event loop keeps running
+        self._import_progress = QProgressDialog(
+            "Importing files...", None, 0, len(file_paths), self
+        )
+        self._import_progress.setWindowModality(Qt.WindowModal)
+        self._import_progress.setMinimumDuration(500)
+        
+        worker = ImportWorker(self.file_importer, file_paths)
+        worker.signals.progress.connect(self.on_import_progress)
+        worker.signals.finished.connect(self.on_import_finished)
+        worker.signals.error.connect(self.on_import_error)
+        self._import_worker = worker
+        QThreadPool.globalInstance().start(worker)
+    
+    def on_import_progress(self, count):
+        """Report the number of files imported so far.
+        
+        Parameters
+        ----------
+        count : int
+            Number of files processed.
+        """
+        if self._import_progress is not None:
+            self._import_progress.setValue(count)
+            self._post_status(f"Importing files... {count}/{self._import_progress.maximum()}")
+    
+    def _post_status(self, message):
+        """Show a progress message in the status bar, rate limited.
+        
+        Parameters
+        ----------
+        message : str
+            Message to show.
+        """
+        self._status_pending = message
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+    
+    def _flush_status(self):
+        """Show the latest pending progress message."""
+        if self._status_pending is not None:
+            self.status_bar.showMessage(self._status_pending)
+            self._status_pending = None
+    
+    def on_import_finished(self, readers):
+        """Handle the end of a background import.
+        
+        Parameters
+        ----------
+        readers : dict
+            Dictionary mapping imported file paths to reader instances.
+        """
+        self._end_import()
+        
+        if readers:
+            # Update widgets
+            self.update_widgets()
+            
+            # Enable actions
+            self.save_action.setEnabled(True)
+            self.export_action.setEnabled(True)
+            self.process_action.setEnabled(True)
             
-            if readers:
-                # Update widgets
-                self.update_widgets()
-                
-                # Enable actions
-                self.save_action.setEnabled(True)
-                self.export_action.setEnabled(True)
-                self.process_action.setEnabled(True)
-                
-                # Emit signal
-                self.files_imported.emit(list(readers.keys()))
-                
-                # Update status
-                self.status_bar.showMessage(
-                    f"Successfully imported {len(readers)} files", 5000
-                )
-                
-                self.logger.info(f"Imported {len(readers)} files")
-            else:
-                QMessageBox.warning(
-                    self, "Import Failed", 
-                    "Failed to import any files. Please check the file formats."
-                )
-                self.status_bar.showMessage("Import failed", 5000)
-        
-        except Exception as e:
-            self.logger.error(f"Error importing files: {e}")
-            QMessageBox.critical(
-                self, "Import Error", 
-                f"An error occurred while importing files:\n{str(e)}"
+            # Emit signal; the path list is only built if anything listens
+            if self.receivers(self.files_imported) > 0:
+                self.files_imported.emit(list(readers))
+            
+            # Update status
+            self.status_bar.showMessage(
+                f"Successfully imported {len(readers)} files", 5000
+            )
+            
+            self.logger.info(f"Imported {len(readers)} files")
+        else:
+            QMessageBox.warning(
+                self, "Import Failed", 
+                "Failed to import any files. Please check the file formats."
             )
-            self.status_bar.showMessage("Import error", 5000)
+            self.status_bar.showMessage("Import failed", 5000)
+    
+    def on_import_error(self, message):
+        """Handle an error raised by a background import.
+        
+        Parameters
+        ----------
+        message : str
+            Error message.
+        """
+        self._end_import()
+        
+        self.logger.error(f"Error importing files: {message}")
+        QMessageBox.critical(
+            self, "Import Error", 
+            f"An error occurred while importing files:\n{message}"
+        )
+        self.status_bar.showMessage("Import error", 5000)
+    
+    def _end_import(self):
+        """Close the import progress dialog and release the worker."""
+        # Drop progress messages that would overwrite the result
+        self._status_timer.stop()
+        self._status_pending = None
+        
+        if self._import_progress is not None:
+            self._import_progress.close()
+            self._import_progress = None
+        self._import_worker = None
     
     def save_data(self):
         """Save current data."""
@@ -387,7 +540,58 @@ class MainWindow(QMainWindow, LoggerMixin):
     
     def show_mask_editor(self):
         """Show the mask editor tab."""
-        self.central_widget.setCurrentWidget(self.mask_editor_widget)
+        self.central_widget.setCurrentWidget(self._ensure_mask_editor())
+    
+    def _ensure_beam_parameter_widget(self, visible=True):
+        """Create the beam parameter widget when its dock is first shown.
+        
+        Parameters
+        ----------
+        visible : bool, optional
+            Whether the dock is visible, by default True
+        """
+        if not visible or self.beam_parameter_widget is not None:
+            return
+        
+        from .widgets import BeamParameterWidget
+        self.beam_parameter_widget = BeamParameterWidget(self.file_importer)
+        self.beam_parameter_widget.parameters_updated.connect(self.on_parameters_updated)
+        
+        placeholder = self.beam_parameter_dock.widget()
+        self.beam_parameter_dock.setWidget(self.beam_parameter_widget)
+        placeholder.deleteLater()
+        
+        # Pick up the metadata of files imported before the dock was shown
+        if len(self.file_importer):
+            self.beam_parameter_widget.load_from_file()
+    
+    def _ensure_mask_editor(self):
+        """Create the mask editor on first use, replacing its placeholder tab.
+        
+        Returns
+        -------
+        MaskEditorWidget
+            The mask editor widget.
+        """
+        if self.mask_editor_widget is None:
+            from .widgets import MaskEditorWidget
+            self.mask_editor_widget = MaskEditorWidget(self.file_importer)
+            # Direct connection: the slot runs in the emitting call, so a
+            # delta is applied before the editor changes the mask again
+            self.mask_editor_widget.mask_updated.connect(self.on_mask_updated, Qt.DirectConnection)
+            
+            # Swap the tab without re-entering on_tab_changed
+            tabs = self.central_widget
+            index = tabs.indexOf(self._mask_editor_placeholder)
+            current = tabs.currentIndex()
+            tabs.blockSignals(True)
+            tabs.removeTab(index)
+            tabs.insertTab(index, self.mask_editor_widget, "Mask Editor")
+            tabs.setCurrentIndex(current)
+            tabs.blockSignals(False)
+            self._mask_editor_placeholder.deleteLater()
+            self._mask_editor_placeholder = None
+        return self.mask_editor_widget
     
     def process_data(self):
         """Process loaded data."""
@@ -445,11 +649,13 @@ class MainWindow(QMainWindow, LoggerMixin):
         # Update data preview
         self.data_preview_widget.set_file_importer(self.file_importer)
         
-        # Update mask editor
-        self.mask_editor_widget.set_file_importer(self.file_importer)
+        # Update mask editor, if it has been created
+        if self.mask_editor_widget is not None:
+            self.mask_editor_widget.set_file_importer(self.file_importer)
         
-        # Update beam parameter widget
-        self.beam_parameter_widget.set_file_importer(self.file_importer)
+        # Update beam parameter widget, if it has been created
+        if self.beam_parameter_widget is not None:
+            self.beam_parameter_widget.set_file_importer(self.file_importer)
     
     def on_files_selected(self, file_paths):
         """Handle file selection from file browser.
@@ -459,7 +665,8 @@ class MainWindow(QMainWindow, LoggerMixin):
         file_paths : list
             List of selected file paths.
         """
-        self.logger.debug(f"Files selected: {file_paths}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Files selected: {file_paths}")
     
     def on_files_imported(self, file_paths):
         """Handle files imported from file browser.
@@ -480,9 +687,15 @@ class MainWindow(QMainWindow, LoggerMixin):
         
         Parameters
         ----------
-        mask : np.ndarray
-            Updated mask array.
+        mask : np.ndarray or MaskDelta
+            Updated mask array, or the change to apply to the current one.
         """
+        if isinstance(mask, MaskDelta):
+            if self.current_mask is not None:
+                mask.apply(self.current_mask)
+        else:
+            # Own copy, allocated once per mask rather than per edit
+            self.current_mask = np.array(mask, dtype=bool)
         self.logger.debug("Mask updated")
         # TODO: Apply mask to data processing
     
@@ -494,7 +707,8 @@ class MainWindow(QMainWindow, LoggerMixin):
         parameters : dict
             Updated parameters.
         """
-        self.logger.debug(f"Parameters updated: {parameters}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Parameters updated: {parameters}")
         # TODO: Apply parameters to data processing
     
     def on_tab_changed(self, index):
@@ -505,13 +719,17 @@ class MainWindow(QMainWindow, LoggerMixin):
         index : int
             Index of the current tab.
         """
+        if (self.mask_editor_widget is None
+                and self.central_widget.widget(index) is self._mask_editor_placeholder):
+            self._ensure_mask_editor()
+        
         tab_names = ["Data Preview", "Mask Editor"]
-        if 0 <= index < len(tab_names):
+        if 0 <= index < len(tab_names) and self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(f"Switched to tab: {tab_names[index]}")
     
     def load_settings(self):
         """Load application settings."""
-        settings = QSettings("SAXS-XPCS", "Analysis Suite")
+        settings = self._settings
         
         # Load window geometry
         geometry = settings.value("geometry")
@@ -524,13 +742,13 @@ class MainWindow(QMainWindow, LoggerMixin):
             self.restoreState(state)
         
         # Load last directory
-        last_dir = settings.value("lastDirectory", os.path.expanduser("~"))
+        last_dir = settings.value("lastDirectory", self._home)
         if os.path.exists(last_dir):
             self.file_browser_widget.set_directory(last_dir)
     
     def save_settings(self):
         """Save application settings."""
-        settings = QSettings("SAXS-XPCS", "Analysis Suite")
+        settings = self._settings
         
         # Save window geometry
         settings.setValue("geometry", self.saveGeometry())
@@ -554,6 +772,13 @@ class MainWindow(QMainWindow, LoggerMixin):
         # Save settings
         self.save_settings()
         
+        # Stop a running import after the files in progress and let it finish
+        # before its readers are closed
+        if self._import_worker is not None:
+            self._import_worker.cancel()
+        if not QThreadPool.globalInstance().waitForDone(CLOSE_TIMEOUT_MS):
+            self.logger.warning("Background work still running on close")
+        
         # Close file readers
         self.file_importer.clear()
         
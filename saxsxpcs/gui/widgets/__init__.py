@@ -5,10 +5,7 @@
 Widget modules for the SAXS and XPCS Analysis Suite GUI.
 """
 
-from .file_browser_widget import FileBrowserWidget
-from .data_preview_widget import DataPreviewWidget
-from .mask_editor_widget import MaskEditorWidget
-from .beam_parameter_widget import BeamParameterWidget
+import importlib
 
 __all__ = [
     'FileBrowserWidget',
@@ -17,3 +14,26 @@ __all__ = [
     'BeamParameterWidget',
 ]
 
+# Module defining each widget; imported on first access, so a widget's
+# plotting dependencies are only loaded when it is used
+_LAZY_IMPORTS = {
+    'FileBrowserWidget': '.file_browser_widget',
+    'DataPreviewWidget': '.data_preview_widget',
+    'MaskEditorWidget': '.mask_editor_widget',
+    'BeamParameterWidget': '.beam_parameter_widget',
+}
+
+
+def __getattr__(name):
+    """Import widget classes on first access and cache them in the module."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List module attributes, including widget classes not imported yet."""
+    return sorted(set(globals()) | set(__all__))
@@ -5,17 +5,23 @@
 Beam parameter widget for the SAXS-XPCS Analysis Suite.
 """
 
+import math
 import logging
+from functools import partial
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, 
     QLineEdit, QPushButton, QDoubleSpinBox, QGroupBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QSignalBlocker, QTimer, pyqtSignal
 
 from ...utils.logging_config import LoggerMixin
 
 logger = logging.getLogger(__name__)
 
+# Delay in milliseconds after the last spin box change before
+# parameters_updated is emitted
+PARAMETER_DEBOUNCE_MS = 100
+
 class BeamParameterWidget(QWidget, LoggerMixin):
     """Widget for managing beam parameters."""
     
@@ -37,6 +43,18 @@ class BeamParameterWidget(QWidget, LoggerMixin):
         self.file_importer = file_importer
         self.parameters = {}
         
+        # Spin boxes keyed by parameter name, filled in init_ui
+        self._spins = {}
+        
+        # Parameters sent with the last parameters_updated signal
+        self._emitted = None
+        
+        # Coalesces bursts of spin box changes into one parameters_updated
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(PARAMETER_DEBOUNCE_MS)
+        self._emit_timer.timeout.connect(self._emit_parameters)
+        
         self.init_ui()
         self.logger.debug("Beam parameter widget initialized")
     
@@ -52,13 +70,13 @@ class BeamParameterWidget(QWidget, LoggerMixin):
         self.beam_center_x_spin = QDoubleSpinBox()
         self.beam_center_x_spin.setRange(0, 10000)
         self.beam_center_x_spin.setValue(500)
-        self.beam_center_x_spin.valueChanged.connect(self.on_parameter_changed)
+        self._register_spin('beam_center_x', self.beam_center_x_spin)
         beam_layout.addRow("Beam Center X:", self.beam_center_x_spin)
         
         self.beam_center_y_spin = QDoubleSpinBox()
         self.beam_center_y_spin.setRange(0, 10000)
         self.beam_center_y_spin.setValue(500)
-        self.beam_center_y_spin.valueChanged.connect(self.on_parameter_changed)
+        self._register_spin('beam_center_y', self.beam_center_y_spin)
         beam_layout.addRow("Beam Center Y:", self.beam_center_y_spin)
         
         # Detector distance
@@ -66,7 +84,7 @@ class BeamParameterWidget(QWidget, LoggerMixin):
         self.detector_distance_spin.setRange(0.1, 100.0)
         self.detector_distance_spin.setValue(1.0)
         self.detector_distance_spin.setSuffix(" m")
-        self.detector_distance_spin.valueChanged.connect(self.on_parameter_changed)
+        self._register_spin('detector_distance', self.detector_distance_spin)
         beam_layout.addRow("Detector Distance:", self.detector_distance_spin)
         
         # Wavelength
@@ -75,7 +93,7 @@ class BeamParameterWidget(QWidget, LoggerMixin):
         self.wavelength_spin.setValue(1.0)
         self.wavelength_spin.setSuffix(" Å")
         self.wavelength_spin.setDecimals(4)
-        self.wavelength_spin.valueChanged.connect(self.on_parameter_changed)
+        self._register_spin('wavelength', self.wavelength_spin)
         beam_layout.addRow("Wavelength:", self.wavelength_spin)
         
         # Pixel size
@@ -84,7 +102,7 @@ class BeamParameterWidget(QWidget, LoggerMixin):
         self.pixel_size_x_spin.setValue(75e-6)
         self.pixel_size_x_spin.setSuffix(" m")
         self.pixel_size_x_spin.setDecimals(6)
-        self.pixel_size_x_spin.valueChanged.connect(self.on_parameter_changed)
+        self._register_spin('pixel_size_x', self.pixel_size_x_spin)
         beam_layout.addRow("Pixel Size X:", self.pixel_size_x_spin)
         
         self.pixel_size_y_spin = QDoubleSpinBox()
@@ -92,7 +110,7 @@ class BeamParameterWidget(QWidget, LoggerMixin):
         self.pixel_size_y_spin.setValue(75e-6)
         self.pixel_size_y_spin.setSuffix(" m")
         self.pixel_size_y_spin.setDecimals(6)
-        self.pixel_size_y_spin.valueChanged.connect(self.on_parameter_changed)
+        self._register_spin('pixel_size_y', self.pixel_size_y_spin)
         beam_layout.addRow("Pixel Size Y:", self.pixel_size_y_spin)
         
         beam_group.setLayout(beam_layout)
@@ -136,55 +154,92 @@ class BeamParameterWidget(QWidget, LoggerMixin):
         self.file_importer = file_importer
         self.load_from_file()
     
+    def _register_spin(self, key, spin):
+        """Register the spin box editing a parameter.
+        
+        Parameters
+        ----------
+        key : str
+            Parameter name.
+        spin : QDoubleSpinBox
+            Spin box editing the parameter.
+        """
+        self._spins[key] = spin
+        spin.valueChanged[float].connect(partial(self._on_field_changed, key))
+    
+    def _on_field_changed(self, key, value):
+        """Store a changed parameter and schedule parameters_updated."""
+        self.parameters[key] = value
+        self._emit_timer.start()
+    
     def on_parameter_changed(self):
-        """Handle parameter change."""
-        self.update_parameters()
-        self.parameters_updated.emit(self.parameters)
+        """Handle parameter change; emission is deferred until changes settle."""
+        self._emit_timer.start()
+    
+    def _emit_parameters(self):
+        """Emit parameters_updated with a copy of the current parameters.
+        
+        Nothing is emitted if the parameters match those last emitted.
+        """
+        self._emit_timer.stop()
+        if self._emitted is not None and self._same_parameters(self.parameters, self._emitted):
+            return
+        self._emitted = dict(self.parameters)
+        self.parameters_updated.emit(dict(self.parameters))
+    
+    @staticmethod
+    def _same_parameters(first, second):
+        """Compare parameter dictionaries, allowing for floating-point noise."""
+        return first.keys() == second.keys() and all(
+            math.isclose(value, second[key]) for key, value in first.items()
+        )
+    
+    @staticmethod
+    def _set_spin(spin, value):
+        """Set a spin box value without emitting valueChanged.
+        
+        Values that round to the current one at the spin box's precision are
+        skipped, saving the text conversion and repaint of ``setValue``.
+        """
+        if abs(spin.value() - value) < 0.5 * 10 ** -spin.decimals():
+            return
+        with QSignalBlocker(spin):
+            spin.setValue(value)
     
     def update_parameters(self):
-        """Update the parameters dictionary."""
-        self.parameters = {
-            'beam_center_x': self.beam_center_x_spin.value(),
-            'beam_center_y': self.beam_center_y_spin.value(),
-            'detector_distance': self.detector_distance_spin.value(),
-            'wavelength': self.wavelength_spin.value(),
-            'pixel_size_x': self.pixel_size_x_spin.value(),
-            'pixel_size_y': self.pixel_size_y_spin.value(),
-        }
+        """Update the parameters dictionary from the spin boxes.
+        
+        Returns
+        -------
+        bool
+            True if any parameter changed.
+        """
+        parameters = {key: spin.value() for key, spin in self._spins.items()}
+        changed = not self._same_parameters(parameters, self.parameters)
+        self.parameters = parameters
+        return changed
     
     def load_from_file(self):
         """Load parameters from the current file."""
         if not self.file_importer or len(self.file_importer) == 0:
             return
         
-        # Get the first reader
-        readers = self.file_importer.get_all_readers()
-        if not readers:
+        # Get the first reader without copying the reader dictionary
+        first_path = next(iter(self.file_importer), None)
+        reader = self.file_importer.get_reader(first_path) if first_path is not None else None
+        if reader is None:
             return
         
-        reader = list(readers.values())[0]
         metadata = reader.get_metadata()
         
         # Update parameters from metadata
-        if 'beam_center_x' in metadata:
-            self.beam_center_x_spin.setValue(float(metadata['beam_center_x']))
-        
-        if 'beam_center_y' in metadata:
-            self.beam_center_y_spin.setValue(float(metadata['beam_center_y']))
-        
-        if 'detector_distance' in metadata:
-            self.detector_distance_spin.setValue(float(metadata['detector_distance']))
-        
-        if 'wavelength' in metadata:
-            self.wavelength_spin.setValue(float(metadata['wavelength']))
-        
-        if 'pixel_size_x' in metadata:
-            self.pixel_size_x_spin.setValue(float(metadata['pixel_size_x']))
-        
-        if 'pixel_size_y' in metadata:
-            self.pixel_size_y_spin.setValue(float(metadata['pixel_size_y']))
+        for key, spin in self._spins.items():
+            value = metadata.get(key)
+            if value is not None:
+                self._set_spin(spin, float(value))
         
         self.update_parameters()
+        self._emit_parameters()
         self.info_label.setText("Parameters loaded from file metadata.")
         self.logger.info("Parameters loaded from file metadata")
     
@@ -195,14 +250,15 @@ class BeamParameterWidget(QWidget, LoggerMixin):
     
     def reset_parameters(self):
         """Reset parameters to defaults."""
-        self.beam_center_x_spin.setValue(500)
-        self.beam_center_y_spin.setValue(500)
-        self.detector_distance_spin.setValue(1.0)
-        self.wavelength_spin.setValue(1.0)
-        self.pixel_size_x_spin.setValue(75e-6)
-        self.pixel_size_y_spin.setValue(75e-6)
+        self._set_spin(self.beam_center_x_spin, 500)
+        self._set_spin(self.beam_center_y_spin, 500)
+        self._set_spin(self.detector_distance_spin, 1.0)
+        self._set_spin(self.wavelength_spin, 1.0)
+        self._set_spin(self.pixel_size_x_spin, 75e-6)
+        self._set_spin(self.pixel_size_y_spin, 75e-6)
         
         self.update_parameters()
+        self._emit_parameters()
         self.info_label.setText("Parameters reset to defaults.")
         self.logger.info("Parameters reset to defaults")
 
@@ -8,30 +8,79 @@ Data preview widget for the SAXS-XPCS Analysis Suite.
 import logging
 import os
 import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, 
-    QSplitter, QListWidget, QListWidgetItem
+    QSplitter, QListWidget, QListWidgetItem, QStackedWidget
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QThreadPool, QTimer, pyqtSignal
 
 try:
-    import matplotlib.pyplot as plt
+    import matplotlib as mpl
     from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.colors import Normalize
     from matplotlib.figure import Figure
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
+if MATPLOTLIB_AVAILABLE:
+    # Simplify long lines more aggressively and render them in chunks; the
+    # simplification only drops vertices that do not change the drawn path
+    # by more than a pixel
+    mpl.rcParams['path.simplify'] = True
+    mpl.rcParams['path.simplify_threshold'] = 1.0
+    mpl.rcParams['agg.path.chunksize'] = 10000
+    mpl.rcParams['figure.autolayout'] = False
+
+try:
+    import pyqtgraph as pg
+    PYQTGRAPH_AVAILABLE = True
+except ImportError:
+    PYQTGRAPH_AVAILABLE = False
+
+from ...utils._fast_stats import robust_clim
 from ...utils.logging_config import LoggerMixin
+from ..workers import DataLoadWorker
 
 logger = logging.getLogger(__name__)
 
+# Smallest long-side size in pixels images are downsampled to, so that a
+# canvas which has not been laid out yet does not collapse the image
+MIN_DISPLAY_PIXELS = 512
+
+# Delay in milliseconds after the last file or plot type change before the
+# plot is redrawn
+REPLOT_DEBOUNCE_MS = 75
+
+# Number of files whose metadata, and of plots whose data, are kept for
+# switching back without reading the file again
+PREVIEW_CACHE_SIZE = 16
+
+@dataclass(frozen=True)
+class PlotSpec:
+    """Everything that determines the content of a preview plot.
+    
+    Two equal specs draw the same plot, so a replot is skipped when the spec
+    has not changed since the last one drawn.
+    """
+    
+    file_path: str
+    plot_type: str
+    frame: int = 0
+
 class DataPreviewWidget(QWidget, LoggerMixin):
     """Widget for previewing SAXS and XPCS data."""
     
     # Signals
     data_changed = pyqtSignal()
     
+    # Key of the axes used for text messages
+    MESSAGE_AXES = "message"
+    
     def __init__(self, file_importer=None, parent=None):
         """Initialize the data preview widget.
         
@@ -47,6 +96,45 @@ class DataPreviewWidget(QWidget, LoggerMixin):
         self.file_importer = file_importer
         self.current_reader = None
         
+        # Axes, artists and colorbars are kept per plot type and updated in
+        # place instead of clearing the figure on every plot; line plots keep
+        # a list of lines
+        self._axes = {}
+        self._artists = {}
+        self._colorbars = {}
+        
+        # Spec of the plot currently drawn, None if it must be redrawn
+        self._last_spec = None
+        
+        # Plot data is loaded on a pool thread; only the result of the latest
+        # load request is drawn
+        self._load_seq = 0
+        self._pending_spec = None
+        self._load_worker = None
+        
+        # Least recently used caches of metadata by file path and of plot
+        # data by plot spec
+        self._meta_cache = OrderedDict()
+        self._data_cache = OrderedDict()
+        
+        # Canvas background behind the intensity line, saved on each full
+        # draw once live updates have started
+        self._intensity_bg = None
+        
+        # Images are colormapped with a uint8 lookup table instead of by
+        # matplotlib on every draw
+        if MATPLOTLIB_AVAILABLE:
+            # pyplot is only needed here, so it is not imported with the module
+            import matplotlib.pyplot as plt
+            self._cmap = plt.get_cmap('viridis')
+            self._lut = self._cmap(np.arange(self._cmap.N), bytes=True)
+        
+        # Coalesces bursts of selection and plot type changes into one replot
+        self._replot_timer = QTimer(self)
+        self._replot_timer.setSingleShot(True)
+        self._replot_timer.setInterval(REPLOT_DEBOUNCE_MS)
+        self._replot_timer.timeout.connect(self._do_update_plot)
+        
         self.init_ui()
         self.logger.debug("Data preview widget initialized")
     
@@ -89,7 +177,20 @@ class DataPreviewWidget(QWidget, LoggerMixin):
         if MATPLOTLIB_AVAILABLE:
             self.figure = Figure(figsize=(8, 6))
             self.canvas = FigureCanvas(self.figure)
-            splitter.addWidget(self.canvas)
+            self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
+            
+            # With pyqtgraph, images are shown in an ImageView that renders
+            # through the Qt graphics scene and pans and zooms without
+            # re-rasterizing; matplotlib draws the other plots
+            self.plot_stack = QStackedWidget()
+            self.plot_stack.addWidget(self.canvas)
+            if PYQTGRAPH_AVAILABLE:
+                self.image_view = pg.ImageView(view=pg.PlotItem())
+                self.image_view.getView().invertY(False)
+                self.image_view.setColorMap(pg.colormap.get('viridis'))
+                self.image_view.getImageItem().setAutoDownsample(True)
+                self.plot_stack.addWidget(self.image_view)
+            splitter.addWidget(self.plot_stack)
         else:
             no_plot_label = QLabel("Matplotlib not available.\nPlease install matplotlib to view plots.")
             no_plot_label.setAlignment(Qt.AlignCenter)
@@ -114,15 +215,26 @@ class DataPreviewWidget(QWidget, LoggerMixin):
     
     def update_file_list(self):
         """Update the file list."""
-        self.file_list.clear()
-        
-        if not self.file_importer:
-            return
+        # Readers may have been replaced by a new import
+        self._last_spec = None
+        self._pending_spec = None
+        self._meta_cache.clear()
+        self._data_cache.clear()
         
-        for file_path in self.file_importer.get_file_list():
-            item = QListWidgetItem(os.path.basename(file_path))
-            item.setData(Qt.UserRole, file_path)
-            self.file_list.addItem(item)
+        # Refill the list with its signals blocked and updates disabled, so
+        # the list repaints once and only the final selection is handled
+        self.file_list.setUpdatesEnabled(False)
+        self.file_list.blockSignals(True)
+        try:
+            self.file_list.clear()
+            if self.file_importer:
+                for file_path in self.file_importer.get_file_list():
+                    item = QListWidgetItem(os.path.basename(file_path))
+                    item.setData(Qt.UserRole, file_path)
+                    self.file_list.addItem(item)
+        finally:
+            self.file_list.blockSignals(False)
+            self.file_list.setUpdatesEnabled(True)
         
         # Select first item if available
         if self.file_list.count() > 0:
@@ -143,7 +255,12 @@ class DataPreviewWidget(QWidget, LoggerMixin):
             self.info_label.setText("No data loaded")
             return
         
-        metadata = self.current_reader.get_metadata()
+        file_path = self.current_reader.file_path
+        metadata = self._meta_cache.get(file_path)
+        if metadata is None:
+            metadata = self.current_reader.get_metadata()
+        self._cache_put(self._meta_cache, file_path, metadata)
+        
         beamline = metadata.get('beamline', 'Unknown')
         facility = metadata.get('facility', 'Unknown')
         
@@ -156,18 +273,112 @@ class DataPreviewWidget(QWidget, LoggerMixin):
         
         self.info_label.setText(info_text)
     
+    @staticmethod
+    def _cache_put(cache, key, value):
+        """Store a value in a least recently used cache.
+        
+        Parameters
+        ----------
+        cache : OrderedDict
+            Cache, ordered from least to most recently used.
+        key : hashable
+            Key of the value.
+        value : object
+            Value to store.
+        """
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > PREVIEW_CACHE_SIZE:
+            cache.popitem(last=False)
+    
     def update_plot(self):
-        """Update the plot."""
+        """Schedule a plot update.
+        
+        The plot is redrawn REPLOT_DEBOUNCE_MS after the last call, so
+        stepping quickly through files or plot types only draws the final one.
+        """
+        self._replot_timer.start()
+    
+    def _do_update_plot(self):
+        """Update the plot.
+        
+        The reader is accessed on a thread pool thread; the plot is drawn
+        when the data arrives in ``on_plot_data_loaded``.
+        """
         if not MATPLOTLIB_AVAILABLE or not self.current_reader:
             return
         
         plot_type = self.plot_type_combo.currentText()
+        spec = PlotSpec(self.current_reader.file_path, plot_type)
+        if spec == self._last_spec or spec == self._pending_spec:
+            return
+        
+        self._load_seq += 1
+        self._pending_spec = spec
+        if spec in self._data_cache:
+            # Drawn right away; the bumped sequence drops any load in flight
+            self.on_plot_data_loaded(self._load_seq, self._data_cache[spec])
+            return
+        
+        load = partial(self._load_plot_data, self.current_reader, plot_type)
+        worker = DataLoadWorker(self._load_seq, load)
+        worker.signals.loaded.connect(self.on_plot_data_loaded)
+        worker.signals.error.connect(self.on_plot_data_error)
+        self._load_worker = worker
+        QThreadPool.globalInstance().start(worker)
+    
+    @staticmethod
+    def _load_plot_data(reader, plot_type):
+        """Read the data a plot type needs from a reader.
+        
+        Runs on a thread pool thread, so it must not touch any widget.
+        
+        Parameters
+        ----------
+        reader : BaseReader
+            Reader of the selected file.
+        plot_type : str
+            Plot type to load the data for.
+        
+        Returns
+        -------
+        object
+            The frame or XPCS data dictionary to plot, or None for plot
+            types that need no data.
+        """
+        if plot_type == "2D Pattern":
+            # Only the first frame of an image stack is read
+            return reader.get_frame(0)
+        elif plot_type == "g2":
+            return reader.get_xpcs_data(('g2', 'tau'))
+        elif plot_type == "Intensity vs Time":
+            return reader.get_xpcs_data(('intensity',))
+        elif plot_type == "Two-Time Correlation":
+            return reader.get_xpcs_data(('twotime',))
+        return None
+    
+    def on_plot_data_loaded(self, request_id, data):
+        """Draw the plot once its data is loaded.
+        
+        Parameters
+        ----------
+        request_id : int
+            Id of the load request; results of superseded requests are dropped.
+        data : object
+            Data returned by ``_load_plot_data``.
+        """
+        if request_id != self._load_seq or self._pending_spec is None:
+            return
+        
+        spec = self._pending_spec
+        self._pending_spec = None
+        self._load_worker = None
+        self._cache_put(self._data_cache, spec, data)
+        plot_type = spec.plot_type
         
         try:
-            self.figure.clear()
-            
             if plot_type == "2D Pattern":
-                self.plot_2d_pattern()
+                self.plot_2d_pattern(data)
             elif plot_type == "1D Curve":
                 self.plot_1d_curve()
             elif plot_type == "Kratky Plot":
@@ -175,125 +386,488 @@ class DataPreviewWidget(QWidget, LoggerMixin):
             elif plot_type == "Guinier Plot":
                 self.plot_guinier()
             elif plot_type == "g2":
-                self.plot_g2()
+                self.plot_g2(data)
             elif plot_type == "Intensity vs Time":
-                self.plot_intensity_time()
+                self.plot_intensity_time(data)
             elif plot_type == "Two-Time Correlation":
-                self.plot_twotime()
-            
-            self.canvas.draw()
+                self.plot_twotime(data)
             
+            self._last_spec = spec
+        
         except Exception as e:
             self.logger.error(f"Error updating plot: {e}")
-            self.figure.clear()
-            ax = self.figure.add_subplot(111)
-            ax.text(0.5, 0.5, f"Error: {str(e)}", 
-                   ha='center', va='center', transform=ax.transAxes)
-            self.canvas.draw()
+            self._show_message(f"Error: {str(e)}")
+            self._last_spec = None
+        
+        self.canvas.draw_idle()
+    
+    def on_plot_data_error(self, request_id, message):
+        """Show a load error in place of the plot.
+        
+        Parameters
+        ----------
+        request_id : int
+            Id of the load request; errors of superseded requests are dropped.
+        message : str
+            Error message.
+        """
+        if request_id != self._load_seq or self._pending_spec is None:
+            return
+        
+        self._pending_spec = None
+        self._load_worker = None
+        self._last_spec = None
+        self._show_message(f"Error: {message}")
+        self.canvas.draw_idle()
+    
+    def _show_axes(self, key):
+        """Make the axes of one plot type the only visible axes.
+        
+        Parameters
+        ----------
+        key : str
+            Key of the axes to show.
+        """
+        for name, ax in self._axes.items():
+            ax.set_visible(name == key)
+        for name, colorbar in self._colorbars.items():
+            colorbar.ax.set_visible(name == key)
+    
+    def _get_axes(self, key, title="", xlabel="", ylabel=""):
+        """Get the persistent axes of a plot type, creating it on first use.
+        
+        Parameters
+        ----------
+        key : str
+            Key of the axes, usually the plot type.
+        title : str, optional
+            Axes title, by default ""
+        xlabel : str, optional
+            X axis label, by default ""
+        ylabel : str, optional
+            Y axis label, by default ""
+        
+        Returns
+        -------
+        matplotlib.axes.Axes
+            The axes, shown in place of all others.
+        """
+        ax = self._axes.get(key)
+        if ax is None:
+            # A distinct label keeps add_subplot from returning existing axes
+            ax = self.figure.add_subplot(111, label=key)
+            ax.set_title(title)
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel(ylabel)
+            self._axes[key] = ax
+        
+        self._show_axes(key)
+        self.plot_stack.setCurrentWidget(self.canvas)
+        return ax
+    
+    def _show_message(self, text, title=""):
+        """Show a text message in place of a plot.
+        
+        Parameters
+        ----------
+        text : str
+            Message text.
+        title : str, optional
+            Axes title, by default ""
+        """
+        ax = self._get_axes(self.MESSAGE_AXES)
+        if self.MESSAGE_AXES not in self._artists:
+            ax.set_axis_off()
+            self._artists[self.MESSAGE_AXES] = ax.text(
+                0.5, 0.5, "", ha='center', va='center', transform=ax.transAxes)
+        
+        self._artists[self.MESSAGE_AXES].set_text(text)
+        ax.set_title(title)
+    
+    def _canvas_pixels(self, length):
+        """Convert a canvas length to device pixels.
+        
+        Parameters
+        ----------
+        length : int
+            Length in logical pixels.
+        
+        Returns
+        -------
+        int
+            Length in device pixels, but at least MIN_DISPLAY_PIXELS.
+        """
+        return max(int(length * self.canvas.devicePixelRatioF()), MIN_DISPLAY_PIXELS)
+    
+    def _decimate_for_canvas(self, y):
+        """Reduce a time series to about one point per canvas pixel column.
+        
+        Parameters
+        ----------
+        y : array_like
+            Values, one per index.
+        
+        Returns
+        -------
+        tuple
+            Indices and values of the kept points, taken with a stride.
+        """
+        y = np.asarray(y)
+        step = max(1, len(y) // self._canvas_pixels(self.canvas.width()))
+        return np.arange(0, len(y), step), y[::step]
     
-    def plot_2d_pattern(self):
-        """Plot 2D SAXS pattern."""
-        saxs_data = self.current_reader.get_saxs_data()
-        if saxs_data is None:
-            # Try to get detector data
-            data = self.current_reader.get_data()
-            saxs_data = data.get('detector_data') or data.get('data')
+    def _downsample_for_canvas(self, image, max_px=None):
+        """Reduce an image to about the resolution of the canvas.
+        
+        Pixels beyond the canvas resolution are never visible, but matplotlib
+        still colormaps all of them, so large detector frames are decimated
+        with a stride before they are handed to imshow.
         
+        Parameters
+        ----------
+        image : np.ndarray
+            2D image data.
+        max_px : int, optional
+            Target size of the long side in pixels, by default the long side
+            of the canvas in device pixels, but at least MIN_DISPLAY_PIXELS
+        
+        Returns
+        -------
+        np.ndarray
+            Strided view of the image, or the image itself if it is small
+            enough.
+        """
+        if max_px is None:
+            size = self.canvas.size()
+            max_px = self._canvas_pixels(max(size.width(), size.height()))
+        
+        step = max(1, max(image.shape[:2]) // max_px)
+        if step == 1:
+            return image
+        return image[::step, ::step]
+    
+    def _colormap_image(self, image):
+        """Map an image to RGBA through the lookup table.
+        
+        The color limits are the 1st and 99th percentiles, so a few hot or
+        dead pixels do not wash out the image.
+        
+        Parameters
+        ----------
+        image : np.ndarray
+            2D image data.
+        
+        Returns
+        -------
+        tuple
+            RGBA image as a uint8 array of shape (rows, columns, 4), and the
+            lower and upper color limits.
+        """
+        lo, hi = robust_clim(image, 0.01, 0.99)
+        scale = (len(self._lut) - 1) / (hi - lo) if hi > lo else 0.0
+        
+        scaled = (image - lo) * scale
+        np.clip(scaled, 0, len(self._lut) - 1, out=scaled)
+        np.nan_to_num(scaled, copy=False)
+        return self._lut[scaled.astype(np.uint8)], lo, hi
+    
+    def _show_image(self, plot_type, image, title, xlabel, ylabel):
+        """Show an image on the persistent axes of a plot type.
+        
+        The image artist and its colorbar are created on the first call and
+        updated in place afterwards. Large images are downsampled to the
+        canvas resolution; the axes keep the coordinates of the full image.
+        
+        Parameters
+        ----------
+        plot_type : str
+            Plot type the image belongs to.
+        image : np.ndarray
+            2D image data.
+        title : str
+            Axes title.
+        xlabel : str
+            X axis label.
+        ylabel : str
+            Y axis label.
+        """
+        image = np.asarray(image)
+        if PYQTGRAPH_AVAILABLE:
+            self._show_image_view(image, title, xlabel, ylabel)
+            return
+        
+        height, width = image.shape[:2]
+        extent = (-0.5, width - 0.5, -0.5, height - 0.5)
+        rgba, lo, hi = self._colormap_image(self._downsample_for_canvas(image))
+        
+        ax = self._get_axes(plot_type, title, xlabel, ylabel)
+        im = self._artists.get(plot_type)
+        if im is None:
+            im = ax.imshow(rgba, origin='lower', extent=extent)
+            self._artists[plot_type] = im
+            # The colorbar shows the lookup table through a mappable of its own
+            mappable = ScalarMappable(Normalize(lo, hi), self._cmap)
+            self._colorbars[plot_type] = self.figure.colorbar(mappable, ax=ax)
+            return
+        
+        im.set_data(rgba)
+        im.set_extent(extent)
+        self._colorbars[plot_type].mappable.set_clim(lo, hi)
+        ax.set_xlim(extent[:2])
+        ax.set_ylim(extent[2:])
+    
+    def _show_image_view(self, image, title, xlabel, ylabel):
+        """Show an image in the pyqtgraph image view.
+        
+        The view downsamples the image to the screen resolution itself, so it
+        is passed in full.
+        
+        Parameters
+        ----------
+        image : np.ndarray
+            2D image data.
+        title : str
+            Plot title.
+        xlabel : str
+            X axis label.
+        ylabel : str
+            Y axis label.
+        """
+        lo, hi = robust_clim(image, 0.01, 0.99)
+        if hi <= lo:
+            hi = lo + 1.0
+        
+        view = self.image_view.getView()
+        view.setTitle(title)
+        view.setLabel('bottom', xlabel)
+        view.setLabel('left', ylabel)
+        self.image_view.setImage(image, autoLevels=False, levels=(lo, hi), axes={'x': 1, 'y': 0})
+        self.plot_stack.setCurrentWidget(self.image_view)
+    
+    def _show_line(self, plot_type, x, y, title, xlabel, ylabel, log_x=False, fmt='-'):
+        """Show one or more lines on the persistent axes of a plot type.
+        
+        The line artists, one per column of ``y``, are created on the first
+        call and their data replaced afterwards; they are only rebuilt when
+        the number of columns changes.
+        
+        Parameters
+        ----------
+        plot_type : str
+            Plot type the lines belong to.
+        x : array_like
+            X values.
+        y : array_like
+            Y values, 1D or 2D with one column per line, e.g. g2 of shape
+            (n_tau, n_q).
+        title : str
+            Axes title.
+        xlabel : str
+            X axis label.
+        ylabel : str
+            Y axis label.
+        log_x : bool, optional
+            Whether the x axis is logarithmic, by default False
+        fmt : str, optional
+            Line format used when the lines are created, by default '-'
+        """
+        columns = self._line_columns(y)
+        ax = self._get_axes(plot_type, title, xlabel, ylabel)
+        ax.set_xlabel(xlabel)
+        ax.set_xscale('log' if log_x else 'linear')
+        lines = self._artists.get(plot_type)
+        if lines is None or len(lines) != columns.shape[1]:
+            for line in lines or ():
+                line.remove()
+            # Restart the color cycle so rebuilt lines get the same colors
+            ax.set_prop_cycle(None)
+            lines = ax.plot(x, columns, fmt)
+            ax.grid(True)
+            self._artists[plot_type] = lines
+        else:
+            for line, column in zip(lines, columns.T):
+                line.set_data(x, column)
+        
+        ax.relim()
+        ax.autoscale_view()
+    
+    @staticmethod
+    def _line_columns(y):
+        """Get line data as a 2D array with one column per line.
+        
+        Parameters
+        ----------
+        y : array_like
+            Y values, 1D for a single line or 2D with one column per line;
+            further dimensions are flattened into columns.
+        
+        Returns
+        -------
+        np.ndarray
+            2D view of the values.
+        """
+        y = np.asarray(y)
+        return y.reshape(len(y), -1) if y.ndim else y.reshape(1, 1)
+    
+    def plot_2d_pattern(self, saxs_data):
+        """Plot 2D SAXS pattern.
+        
+        Parameters
+        ----------
+        saxs_data : np.ndarray or None
+            2D detector frame.
+        """
         if saxs_data is not None:
-            # Take first frame if 3D
-            if saxs_data.ndim == 3:
-                saxs_data = saxs_data[0]
-            
-            ax = self.figure.add_subplot(111)
-            im = ax.imshow(saxs_data, origin='lower', cmap='viridis')
-            ax.set_title("2D SAXS Pattern")
-            ax.set_xlabel("Pixel X")
-            ax.set_ylabel("Pixel Y")
-            self.figure.colorbar(im, ax=ax)
+            self._show_image("2D Pattern", saxs_data, "2D SAXS Pattern", "Pixel X", "Pixel Y")
         else:
-            ax = self.figure.add_subplot(111)
-            ax.text(0.5, 0.5, "No 2D data available", 
-                   ha='center', va='center', transform=ax.transAxes)
+            self._show_message("No 2D data available")
     
     def plot_1d_curve(self):
         """Plot 1D SAXS curve."""
         # This is a placeholder - would need actual 1D data or azimuthal averaging
-        ax = self.figure.add_subplot(111)
-        ax.text(0.5, 0.5, "1D curve plotting\nnot yet implemented", 
-               ha='center', va='center', transform=ax.transAxes)
-        ax.set_title("1D SAXS Curve")
+        self._show_message("1D curve plotting\nnot yet implemented", "1D SAXS Curve")
     
     def plot_kratky(self):
         """Plot Kratky plot."""
-        ax = self.figure.add_subplot(111)
-        ax.text(0.5, 0.5, "Kratky plot\nnot yet implemented", 
-               ha='center', va='center', transform=ax.transAxes)
-        ax.set_title("Kratky Plot")
+        self._show_message("Kratky plot\nnot yet implemented", "Kratky Plot")
     
     def plot_guinier(self):
         """Plot Guinier plot."""
-        ax = self.figure.add_subplot(111)
-        ax.text(0.5, 0.5, "Guinier plot\nnot yet implemented", 
-               ha='center', va='center', transform=ax.transAxes)
-        ax.set_title("Guinier Plot")
-    
-    def plot_g2(self):
-        """Plot g2 correlation function."""
-        xpcs_data = self.current_reader.get_xpcs_data()
+        self._show_message("Guinier plot\nnot yet implemented", "Guinier Plot")
+    
+    def plot_g2(self, xpcs_data):
+        """Plot g2 correlation function.
+        
+        Parameters
+        ----------
+        xpcs_data : dict
+            XPCS data as returned by the reader's ``get_xpcs_data``.
+        """
         g2 = xpcs_data.get('g2')
         tau = xpcs_data.get('tau')
         
         if g2 is not None:
-            ax = self.figure.add_subplot(111)
-            
             if tau is not None and len(tau) == len(g2):
-                ax.semilogx(tau, g2, 'o-')
-                ax.set_xlabel("Delay Time (s)")
+                self._show_line("g2", tau, g2, "g2 Correlation Function", "Delay Time (s)", "g2",
+                                log_x=True, fmt='o-')
             else:
-                ax.plot(g2, 'o-')
-                ax.set_xlabel("Delay Index")
-            
-            ax.set_ylabel("g2")
-            ax.set_title("g2 Correlation Function")
-            ax.grid(True)
+                self._show_line("g2", np.arange(len(g2)), g2, "g2 Correlation Function",
+                                "Delay Index", "g2", fmt='o-')
         else:
-            ax = self.figure.add_subplot(111)
-            ax.text(0.5, 0.5, "No g2 data available", 
-                   ha='center', va='center', transform=ax.transAxes)
+            self._show_message("No g2 data available")
     
-    def plot_intensity_time(self):
-        """Plot intensity vs time."""
-        xpcs_data = self.current_reader.get_xpcs_data()
+    def plot_intensity_time(self, xpcs_data):
+        """Plot intensity vs time.
+        
+        Parameters
+        ----------
+        xpcs_data : dict
+            XPCS data as returned by the reader's ``get_xpcs_data``.
+        """
         intensity = xpcs_data.get('intensity')
         
         if intensity is not None:
-            ax = self.figure.add_subplot(111)
-            ax.plot(intensity)
-            ax.set_xlabel("Time Index")
-            ax.set_ylabel("Intensity")
-            ax.set_title("Intensity vs Time")
-            ax.grid(True)
+            # Points beyond one per pixel column are not visible
+            x, y = self._decimate_for_canvas(intensity)
+            self._show_line("Intensity vs Time", x, y, "Intensity vs Time", "Time Index", "Intensity")
         else:
-            ax = self.figure.add_subplot(111)
-            ax.text(0.5, 0.5, "No intensity data available", 
-                   ha='center', va='center', transform=ax.transAxes)
+            self._show_message("No intensity data available")
     
-    def plot_twotime(self):
-        """Plot two-time correlation."""
-        xpcs_data = self.current_reader.get_xpcs_data()
+    def update_intensity_live(self, intensity):
+        """Replace the intensity vs time data during acquisition.
+        
+        After the first call the intensity lines are animated: full draws save
+        the canvas background without them, and updates restore that
+        background and blit only the lines, without re-rendering ticks, grid and labels.
+        The axes are rescaled with a full draw only when the data leaves the
+        current limits.
+        
+        Parameters
+        ----------
+        intensity : array_like
+            Intensity values, one row per time index and, for several
+            series, one column per series.
+        """
+        lines = self._artists.get("Intensity vs Time")
+        if not MATPLOTLIB_AVAILABLE or lines is None:
+            return
+        
+        # The plot no longer shows the data read from the file
+        self._last_spec = None
+        intensity = np.asarray(intensity)
+        x, y = self._decimate_for_canvas(intensity)
+        columns = self._line_columns(y)
+        if len(lines) != columns.shape[1]:
+            # A different number of series needs new lines and a full draw
+            self._show_line("Intensity vs Time", x, columns, "Intensity vs Time",
+                            "Time Index", "Intensity")
+            self.canvas.draw_idle()
+            return
+        
+        ax = lines[0].axes
+        for line, column in zip(lines, columns.T):
+            line.set_data(x, column)
+        
+        if not lines[0].get_animated():
+            # The full draw saves the background and draws the lines over it
+            for line in lines:
+                line.set_animated(True)
+            self.canvas.draw()
+            return
+        
+        x_max = ax.get_xlim()[1]
+        y_min, y_max = ax.get_ylim()
+        if len(intensity) and (len(intensity) - 1 > x_max or np.nanmin(intensity) < y_min
+                               or np.nanmax(intensity) > y_max):
+            ax.relim()
+            ax.autoscale_view()
+            self.canvas.draw_idle()
+            return
+        
+        if self._intensity_bg is None or not ax.get_visible():
+            return
+        self.canvas.restore_region(self._intensity_bg)
+        for line in lines:
+            ax.draw_artist(line)
+        self.canvas.blit(ax.bbox)
+    
+    def _on_canvas_draw(self, event):
+        """Save the background for intensity blitting after a full draw.
+        
+        Full draws also follow canvas resizes, so the saved background always
+        matches the canvas size.
+        
+        Parameters
+        ----------
+        event : matplotlib.backend_bases.DrawEvent
+            Draw event.
+        """
+        lines = self._artists.get("Intensity vs Time")
+        if not lines or not lines[0].get_animated() or not lines[0].axes.get_visible():
+            self._intensity_bg = None
+            return
+        
+        # Animated artists are left out of full draws; draw the lines on top
+        ax = lines[0].axes
+        self._intensity_bg = self.canvas.copy_from_bbox(ax.bbox)
+        for line in lines:
+            ax.draw_artist(line)
+    
+    def plot_twotime(self, xpcs_data):
+        """Plot two-time correlation.
+        
+        Parameters
+        ----------
+        xpcs_data : dict
+            XPCS data as returned by the reader's ``get_xpcs_data``.
+        """
         twotime = xpcs_data.get('twotime')
         
         if twotime is not None:
-            ax = self.figure.add_subplot(111)
-            im = ax.imshow(twotime, origin='lower', cmap='viridis')
-            ax.set_title("Two-Time Correlation")
-            ax.set_xlabel("Time 1")
-            ax.set_ylabel("Time 2")
-            self.figure.colorbar(im, ax=ax)
+            self._show_image("Two-Time Correlation", twotime, "Two-Time Correlation",
+                             "Time 1", "Time 2")
         else:
-            ax = self.figure.add_subplot(111)
-            ax.text(0.5, 0.5, "No two-time data available", 
-                   ha='center', va='center', transform=ax.transAxes)
+            self._show_message("No two-time data available")
     
     def zoom_in(self):
         """Zoom in the plot."""
@@ -310,7 +884,10 @@ class DataPreviewWidget(QWidget, LoggerMixin):
     def zoom_reset(self):
         """Reset zoom to fit."""
         if MATPLOTLIB_AVAILABLE and hasattr(self, 'canvas'):
+            if PYQTGRAPH_AVAILABLE and self.plot_stack.currentWidget() is self.image_view:
+                self.image_view.autoRange()
+                return
             for ax in self.figure.get_axes():
                 ax.autoscale()
-            self.canvas.draw()
+            self.canvas.draw_idle()
 
@@ -14,6 +14,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIcon
 
+from ...file_io.hdf5_reader import HDF5_EXTENSIONS
 from ...utils.logging_config import LoggerMixin
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,9 @@ class FileBrowserWidget(QWidget, LoggerMixin):
         self.current_directory = os.path.expanduser("~")
         self.file_importer = None
         
+        # Paths of the selected files, updated on each selection change
+        self._selected = []
+        
         self.init_ui()
         self.logger.debug("File browser widget initialized")
     
@@ -139,51 +143,58 @@ class FileBrowserWidget(QWidget, LoggerMixin):
     
     def refresh_file_list(self):
         """Refresh the file list."""
-        self.file_list.clear()
-        
-        if not os.path.exists(self.current_directory):
-            return
-        
-        # Supported file extensions
-        supported_extensions = ['.h5', '.hdf5', '.nxs', '.nx']
-        
-        try:
-            files = os.listdir(self.current_directory)
-            data_files = []
-            
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in supported_extensions):
-                    data_files.append(file)
-            
-            # Sort files
-            data_files.sort()
+        data_files = []
+        if os.path.exists(self.current_directory):
+            try:
+                # Directory entries carry their type from the listing, so files
+                # are told from directories without a stat call each; one
+                # C-level endswith call per name against the supported extensions
+                with os.scandir(self.current_directory) as entries:
+                    data_files = sorted(
+                        (entry.name, entry.path) for entry in entries
+                        if entry.name.lower().endswith(HDF5_EXTENSIONS) and entry.is_file()
+                    )
+                self.logger.debug(f"Found {len(data_files)} data files in {self.current_directory}")
             
-            # Add files to list
-            for file in data_files:
-                item = QListWidgetItem(file)
-                item.setData(Qt.UserRole, os.path.join(self.current_directory, file))
+            except Exception as e:
+                self.logger.error(f"Error reading directory {self.current_directory}: {e}")
+                QMessageBox.warning(
+                    self, "Directory Error", 
+                    f"Error reading directory:\n{str(e)}"
+                )
+        
+        # Refill the list with its signals blocked and updates disabled, so
+        # the list repaints once and the selection change is handled once
+        had_selection = bool(self.file_list.selectedItems())
+        self.file_list.setUpdatesEnabled(False)
+        self.file_list.blockSignals(True)
+        try:
+            self.file_list.clear()
+            for name, path in data_files:
+                item = QListWidgetItem(name)
+                item.setData(Qt.UserRole, path)
                 self.file_list.addItem(item)
-            
+        finally:
+            self.file_list.blockSignals(False)
+            self.file_list.setUpdatesEnabled(True)
+        
+        if had_selection:
+            self.on_selection_changed()
+        else:
             self.update_info_label()
-            self.logger.debug(f"Found {len(data_files)} data files in {self.current_directory}")
-            
-        except Exception as e:
-            self.logger.error(f"Error reading directory {self.current_directory}: {e}")
-            QMessageBox.warning(
-                self, "Directory Error", 
-                f"Error reading directory:\n{str(e)}"
-            )
     
     def get_selected_files(self):
         """Get selected file paths.
         
+        The list is built once per selection change; callers must not
+        modify it.
+        
         Returns
         -------
         list
             List of selected file paths.
         """
-        selected_items = self.file_list.selectedItems()
-        return [item.data(Qt.UserRole) for item in selected_items]
+        return self._selected
     
     def get_all_files(self):
         """Get all file paths in the list.
@@ -213,7 +224,8 @@ class FileBrowserWidget(QWidget, LoggerMixin):
     
     def on_selection_changed(self):
         """Handle selection change."""
-        selected_files = self.get_selected_files()
+        selected_files = [item.data(Qt.UserRole) for item in self.file_list.selectedItems()]
+        self._selected = selected_files
         self.import_btn.setEnabled(len(selected_files) > 0)
         self.files_selected.emit(selected_files)
         self.update_info_label()
@@ -221,7 +233,7 @@ class FileBrowserWidget(QWidget, LoggerMixin):
     def update_info_label(self):
         """Update the info label."""
         total_files = self.file_list.count()
-        selected_files = len(self.get_selected_files())
+        selected_files = len(self._selected)
         
         info_text = f"Total files: {total_files}"
         if selected_files > 0:
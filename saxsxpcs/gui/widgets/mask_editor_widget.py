@@ -6,13 +6,13 @@ Mask editor widget for the SAXS-XPCS Analysis Suite.
 """
 
 import logging
-import numpy as np
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QComboBox, QSpinBox, QCheckBox
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 
+from ...file_io.mask_io import MaskDelta
 from ...utils.logging_config import LoggerMixin
 
 logger = logging.getLogger(__name__)
@@ -20,8 +20,9 @@ logger = logging.getLogger(__name__)
 class MaskEditorWidget(QWidget, LoggerMixin):
     """Widget for editing masks."""
     
-    # Signals
-    mask_updated = pyqtSignal(np.ndarray)
+    # Signals; mask_updated carries either the whole mask, by reference, or
+    # a MaskDelta with the pixels changed by an edit
+    mask_updated = pyqtSignal(object)
     
     def __init__(self, file_importer=None, parent=None):
         """Initialize the mask editor widget.
@@ -78,4 +79,34 @@ class MaskEditorWidget(QWidget, LoggerMixin):
             File importer instance.
         """
         self.file_importer = file_importer
-
+    
+    def set_mask(self, mask):
+        """Replace the current mask.
+        
+        Parameters
+        ----------
+        mask : np.ndarray
+            New mask; it is shared with the receivers of ``mask_updated``,
+            not copied.
+        """
+        self.current_mask = mask
+        self.mask_updated.emit(mask)
+    
+    def update_mask(self, indices, values):
+        """Change pixels of the current mask in place.
+        
+        Only the change is sent with ``mask_updated``.
+        
+        Parameters
+        ----------
+        indices : tuple
+            Index expression selecting the pixels, e.g. row and column arrays.
+        values : np.ndarray or bool
+            New values of the selected pixels.
+        """
+        if self.current_mask is None:
+            return
+        
+        delta = MaskDelta(indices, values)
+        delta.apply(self.current_mask)
+        self.mask_updated.emit(delta)
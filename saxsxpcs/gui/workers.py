@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Background workers for the SAXS-XPCS Analysis Suite GUI.
+"""
+
+import os
+import logging
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from ..file_io.hdf5_reader import HDF5_EXTENSIONS
+from ..file_io.uring_reader import prefetch_files
+
+logger = logging.getLogger(__name__)
+
+# Number of paths found by a directory scan between batch signals
+SCAN_BATCH_SIZE = 256
+
+def scan_directory(root, extensions=HDF5_EXTENSIONS):
+    """Yield paths of files below a directory with one of the given extensions.
+    
+    Uses ``os.scandir``, whose entries carry the file type from the directory
+    listing, so no file is stat'ed. Like ``os.walk``, files of a directory come
+    before those of its subdirectories, symbolic links to directories are not
+    followed and unreadable directories are skipped. Only regular files, or
+    links to them, are yielded.
+    
+    Parameters
+    ----------
+    root : str
+        Directory to scan.
+    extensions : tuple, optional
+        Lowercase file extensions to match, by default HDF5_EXTENSIONS
+    
+    Yields
+    ------
+    str
+        Path of each matching file.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(extensions) and entry.is_file():
+                    yield entry.path
+    except OSError as e:
+        logger.debug(f"Skipping unreadable directory {root}: {e}")
+        return
+    
+    for subdir in subdirs:
+        yield from scan_directory(subdir, extensions)
+
+class WorkerSignals(QObject):
+    """Signals emitted by background workers.
+    
+    QRunnable is not a QObject, so workers carry their signals in a separate
+    object created on the GUI thread; emissions from the pool thread are
+    delivered to GUI slots through queued connections.
+    """
+    
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+class ScanSignals(QObject):
+    """Signals emitted by a directory scan worker."""
+    
+    found_batch = pyqtSignal(list)
+    finished = pyqtSignal()
+
+class LoadSignals(QObject):
+    """Signals emitted by a data load worker, tagged with its request id."""
+    
+    loaded = pyqtSignal(int, object)
+    error = pyqtSignal(int, str)
+
+class ImportWorker(QRunnable):
+    """Import files with a file importer on a thread pool thread."""
+    
+    def __init__(self, file_importer, file_paths):
+        """Initialize the import worker.
+        
+        Parameters
+        ----------
+        file_importer : FileImporter
+            File importer the readers are added to.
+        file_paths : list
+            List of file paths to import.
+        """
+        super().__init__()
+        self.file_importer = file_importer
+        self.file_paths = list(file_paths)
+        self.signals = WorkerSignals()
+        self._cancelled = False
+    
+    def cancel(self):
+        """Ask the worker to stop once the files being imported are done.
+        
+        Files not started yet are skipped and no ``finished`` signal is sent.
+        """
+        self._cancelled = True
+    
+    def run(self):
+        """Import the files, emitting the number done after each file.
+        
+        Emits ``finished`` with the dictionary mapping file paths to readers,
+        or ``error`` with the message if the import raises.
+        """
+        readers = {}
+        try:
+            # Start kernel readahead for all files so later ones find their
+            # pages cached
+            if len(self.file_paths) > 1:
+                prefetch_files(self.file_paths)
+            
+            # Results stream in file order while the importer's pool keeps
+            # working on the following files
+            results = self.file_importer.iter_import(self.file_paths)
+            try:
+                for count, (file_path, reader) in enumerate(results, 1):
+                    if reader is not None:
+                        readers[file_path] = reader
+                    self.signals.progress.emit(count)
+                    if self._cancelled:
+                        break
+            finally:
+                results.close()
+        except Exception as e:
+            logger.error(f"Error importing files: {e}")
+            self.signals.error.emit(str(e))
+            return
+        
+        if self._cancelled:
+            logger.debug(f"Import cancelled after {len(readers)} files")
+            return
+        self.signals.finished.emit(readers)
+
+class ScanWorker(QRunnable):
+    """Find supported data files below a directory on a thread pool thread."""
+    
+    def __init__(self, directory, extensions=HDF5_EXTENSIONS, batch_size=SCAN_BATCH_SIZE):
+        """Initialize the scan worker.
+        
+        Parameters
+        ----------
+        directory : str
+            Directory to scan.
+        extensions : tuple, optional
+            Lowercase file extensions to match, by default HDF5_EXTENSIONS
+        batch_size : int, optional
+            Number of paths sent per ``found_batch`` signal, by default
+            SCAN_BATCH_SIZE
+        """
+        super().__init__()
+        self.directory = directory
+        self.extensions = tuple(extensions)
+        self.batch_size = max(1, batch_size)
+        self.signals = ScanSignals()
+    
+    def run(self):
+        """Scan the directory, sending the paths found in batches."""
+        batch = []
+        for path in scan_directory(self.directory, self.extensions):
+            batch.append(path)
+            if len(batch) >= self.batch_size:
+                self.signals.found_batch.emit(batch)
+                batch = []
+        if batch:
+            self.signals.found_batch.emit(batch)
+        
+        self.signals.finished.emit()
+
+class DataLoadWorker(QRunnable):
+    """Run a data loading call, such as a reader access, on a thread pool thread."""
+    
+    def __init__(self, request_id, load):
+        """Initialize the data load worker.
+        
+        Parameters
+        ----------
+        request_id : int
+            Id sent back with the result, so that the receiver can drop
+            results of requests it has since superseded.
+        load : callable
+            Function without arguments returning the data.
+        """
+        super().__init__()
+        self.request_id = request_id
+        self.load = load
+        self.signals = LoadSignals()
+    
+    def run(self):
+        """Call the load function, emitting ``loaded`` with its result or
+        ``error`` with the message if it raises."""
+        try:
+            data = self.load()
+        except Exception as e:
+            logger.error(f"Error loading data: {e}")
+            self.signals.error.emit(self.request_id, str(e))
+            return
+        
+        self.signals.loaded.emit(self.request_id, data)
@@ -9,11 +9,66 @@ import os
 import sys
 import logging
 import argparse
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QApplication, QSplashScreen
 
-from .gui import MainWindow
 from .utils.logging_config import setup_logging
 
+def _show_splash(app):
+    """Show a splash screen while the main window is built.
+    
+    Parameters
+    ----------
+    app : QApplication
+        The application.
+    
+    Returns
+    -------
+    QSplashScreen
+        The splash screen, to be closed once the main window is shown.
+    """
+    pixmap = QPixmap(400, 120)
+    pixmap.fill(Qt.white)
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("Starting SAXS-XPCS Analysis Suite...", Qt.AlignCenter, Qt.black)
+    splash.show()
+    app.processEvents()
+    return splash
+
+def _deferred_start(app, splash, windows):
+    """Build and show the main window once the event loop is running.
+    
+    The GUI modules, and with them matplotlib and the reader stack, are
+    imported here rather than at startup, so the splash screen appears
+    before their import cost is paid.
+    
+    Parameters
+    ----------
+    app : QApplication
+        The application.
+    splash : QSplashScreen
+        Splash screen to close.
+    windows : list
+        List the main window is appended to, keeping it alive.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        from .gui import MainWindow
+        
+        window = MainWindow()
+        windows.append(window)
+        window.show()
+        splash.finish(window)
+        
+        logger.info("Application started successfully")
+    
+    except Exception as e:
+        logger.error(f"Error starting application: {e}")
+        print(f"Error starting application: {e}")
+        splash.close()
+        app.exit(1)
+
 def main():
     """Main entry point for the SAXS-XPCS Analysis Suite."""
     # Parse command line arguments
@@ -35,15 +90,14 @@ def main():
         app.setOrganizationName("SAXS-XPCS")
         app.setApplicationVersion("0.1.0")
         
-        # Create the main window
-        window = MainWindow()
-        window.show()
-        
-        logger.info("Application started successfully")
+        # Create the main window after the event loop has started
+        splash = _show_splash(app)
+        windows = []
+        QTimer.singleShot(0, lambda: _deferred_start(app, splash, windows))
         
         # Run the application
         sys.exit(app.exec_())
-        
+    
     except Exception as e:
         logger.error(f"Error starting application: {e}")
         print(f"Error starting application: {e}")
@@ -5,12 +5,16 @@
 Logging configuration for the SAXS-XPCS Analysis Suite.
 """
 
+import copy
 import logging
 import logging.config
 import sys
 from pathlib import Path
 
-from ..config import LOG_DIR, LOGGING_CONFIG
+from ..config import LOG_DIR, LOGGING_CONFIG, ensure_dirs
+
+# Arguments of the setup_logging call that configured logging, None before
+_CONFIGURED = None
 
 def setup_logging(debug=False, log_file=None):
     """Setup logging configuration.
@@ -22,8 +26,17 @@ def setup_logging(debug=False, log_file=None):
     log_file : str, optional
         Custom log file path, by default None
     """
-    # Create a copy of the logging config
-    config = LOGGING_CONFIG.copy()
+    global _CONFIGURED
+    
+    # Repeating a call would only recreate the handlers and reopen the log file
+    if _CONFIGURED == (debug, log_file):
+        return
+    
+    # The default log file lives in LOG_DIR
+    ensure_dirs()
+    
+    # Deep copy, as the handler settings below must not change LOGGING_CONFIG
+    config = copy.deepcopy(LOGGING_CONFIG)
     
     # Update log level if debug is enabled
     if debug:
@@ -35,6 +48,12 @@ def setup_logging(debug=False, log_file=None):
     
     # Apply the configuration
     logging.config.dictConfig(config)
+    _CONFIGURED = (debug, log_file)
+    
+    # The formats do not show process or thread, so skip collecting them
+    # for every record
+    logging.logProcesses = False
+    logging.logThreads = False
     
     # Log the startup message
     logger = logging.getLogger(__name__)
@@ -56,12 +75,14 @@ def get_logger(name):
     return logging.getLogger(name)
 
 class LoggerMixin:
-    """Mixin class to add logging functionality to other classes."""
+    """Mixin class to add logging functionality to other classes.
     
-    @property
-    def logger(self):
-        """Get the logger for this class."""
-        if not hasattr(self, '_logger'):
-            self._logger = get_logger(self.__class__.__module__ + '.' + self.__class__.__name__)
-        return self._logger
-
+    Each subclass gets a ``logger`` class attribute named after its module
+    and class when it is defined, so ``self.logger`` is a plain attribute
+    lookup.
+    """
+    
+    def __init_subclass__(cls, **kwargs):
+        """Attach the logger for this class."""
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(cls.__module__ + '.' + cls.__name__)